@@ -7,7 +7,11 @@ VERSION = "0.4.4"
 
 def start(args):
     import code
-    import pyreadline3
+    try:
+        # Line editing; pyreadline3 provides this module on Windows
+        import readline  # noqa: F401
+    except ImportError:
+        pass
     
     
     DBMS.initialize(args.dbms, host=args.host, port=args.port, username=args.username, password=args.password, database=args.database)
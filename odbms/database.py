@@ -48,42 +48,28 @@ class Database:
     
     async def execute_async(self, query: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """Execute a raw query asynchronously."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.execute, query, params
-        )
+        return await asyncio.to_thread(self.execute, query, params)
     
     async def find_async(self, table: str, conditions: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Find records matching conditions asynchronously."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.find, table, conditions
-        )
+        return await asyncio.to_thread(self.find, table, conditions)
     
     async def find_one_async(self, table: str, conditions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find a single record matching conditions asynchronously."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.find_one, table, conditions
-        )
+        return await asyncio.to_thread(self.find_one, table, conditions)
     
     async def insert_async(self, table: str, data: Dict[str, Any]) -> Any:
         """Insert a record asynchronously."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.insert, table, data
-        )
+        return await asyncio.to_thread(self.insert, table, data)
     
     async def insert_many_async(self, table: str, data: List[Dict[str, Any]]) -> int:
         """Insert multiple records asynchronously."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.insert_many, table, data
-        )
+        return await asyncio.to_thread(self.insert_many, table, data)
     
     async def update_async(self, table: str, conditions: Dict[str, Any], data: Dict[str, Any]) -> int:
         """Update records matching conditions asynchronously."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.update, table, conditions, data
-        )
+        return await asyncio.to_thread(self.update, table, conditions, data)
     
     async def remove_async(self, table: str, conditions: Dict[str, Any]) -> int:
         """Remove records matching conditions asynchronously."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.remove, table, conditions
-        )
+        return await asyncio.to_thread(self.remove, table, conditions)
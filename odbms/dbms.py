@@ -1,32 +1,41 @@
-from typing import Optional, Type, Union
+from typing import Optional, Type, Union, TYPE_CHECKING
 from .database import Database
-from .orms.mongodb import MongoDB
-from .orms.sqlitedb import SQLiteDB
-from .orms.postgresqldb import PostgresqlDB
-from .orms.mysqldb import MysqlDB
+
+# Backends are imported on demand in initialize() so installs without a
+# driver (e.g. SQLite only, no psycopg2/aiomysql) can still import odbms
+if TYPE_CHECKING:
+    from .orms.mongodb import MongoDB
+    from .orms.sqlitedb import SQLiteDB
+    from .orms.postgresqldb import PostgresqlDB
+    from .orms.mysqldb import MysqlDB
 
 class DBMS:
     """Database Management System class."""
     
-    Database: Optional[Union[MongoDB, SQLiteDB, PostgresqlDB, MysqlDB]] = None
+    Database: Optional[Union['MongoDB', 'SQLiteDB', 'PostgresqlDB', 'MysqlDB']] = None
     
     @classmethod
     def initialize(cls, dbms: str, database: str, host: str = 'localhost', port: Optional[int] = None, 
                   username: Optional[str] = None, password: Optional[str] = None) -> None:
         """Initialize the database connection."""
         if dbms == 'mongodb':
+            from .orms.mongodb import MongoDB
             cls.Database = MongoDB(
                 host=host,
                 port=port or 27017,
-                database=database
+                database=database,
+                username=username,
+                password=password
             )
             cls.Database.connect()
             cls.Database.dbms = 'mongodb'
         elif dbms == 'sqlite':
+            from .orms.sqlitedb import SQLiteDB
             cls.Database = SQLiteDB(database=database)
             cls.Database.connect()
             cls.Database.dbms = 'sqlite'
         elif dbms == 'postgresql':
+            from .orms.postgresqldb import PostgresqlDB
             cls.Database = PostgresqlDB()
             dbsettings = {
                 'host': host,
@@ -38,6 +47,7 @@ class DBMS:
             cls.Database.connect(dbsettings=dbsettings)
             cls.Database.dbms = 'postgresql'
         elif dbms == 'mysql':
+            from .orms.mysqldb import MysqlDB
             cls.Database = MysqlDB()
             dbsettings = {
                 'host': host,
@@ -1,12 +1,36 @@
 from odbms import DBMS
 
+from functools import lru_cache
 import argparse
+import codeop
+import atexit
+import os
 import sys
 
+try:
+    import readline
+except ImportError:
+    readline = None
+
 Database = None
 
 VERSION = "0.0.1"
 
+HISTORY_FILE = os.path.expanduser('~/.odbms_history')
+
+def _setup_history():
+    if readline is None or sys.flags.interactive:
+        return
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except FileNotFoundError:
+        pass
+    atexit.register(readline.write_history_file, HISTORY_FILE)
+
+@lru_cache(maxsize=256)
+def _compile(src):
+    return codeop.compile_command(src, '<repl>', 'single')
+
 def main(args):
     global parser
     global Database
@@ -17,10 +41,21 @@ def main(args):
     if 'mysql' in args.dbms or 'mongodb' in args.dbms or 'sqlite' in args.dbms:
         DBMS.initialize_with_defaults(args.dbms, args.database)
         Database = DBMS.Database
-        
+    
+    _setup_history()
+    lines = []
     while True:
-        code = input('> ')
-        exec(code)
+        lines.append(input('... ' if lines else '> '))
+        try:
+            code = _compile('\n'.join(lines))
+        except SyntaxError as e:
+            print(e)
+            lines = []
+            continue
+        if code is None:
+            continue
+        lines = []
+        exec(code, globals())
     
 def get_arguments():
     global parser
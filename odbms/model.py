@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Optional, Self, Union, Any, List, Dict, Type, ClassVar, cast, Callable, Coroutine, Annotated
+from typing import Optional, Union, Any, List, Dict, Type, ClassVar, cast, Callable, Coroutine, Annotated
+from typing_extensions import Self
 import inspect
 import json
 import asyncio
@@ -8,7 +9,6 @@ from bson.objectid import ObjectId
 import inflect
 from pydantic import BaseModel, Field, ValidationError, field_serializer
 from .dbms import DBMS
-from .orms.mongodb import MongoDB
 from .fields import (
     Field as ModelField,
     RelationshipField,
@@ -17,6 +17,17 @@ from .fields import (
     ManyToMany,
 )
 
+# MongoDB-style query operators and the SQL comparison each is translated to
+_SQL_OPERATORS = {
+    '$lt': '<',
+    '$lte': '<=',
+    '$gt': '>',
+    '$gte': '>=',
+    '$ne': '!=',
+    '$in': 'IN',
+    '$nin': 'NOT IN',
+}
+
 class ModelMetaclass(type(BaseModel)):
     """Metaclass for Model to handle field definitions and inheritance."""
     
@@ -220,7 +231,7 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         if DBMS.Database is None:
             raise RuntimeError("Database not initialized")
             
-        if isinstance(DBMS.Database, MongoDB):
+        if DBMS.Database.dbms == 'mongodb':
             if optype == 'dbresult':
                 content = dict(content)
                 content['id'] = str(content.pop('_id'))
@@ -235,20 +246,9 @@ class Model(BaseModel, metaclass=ModelMetaclass):
                     if isinstance(value, dict) and all(k.startswith('$') for k in value.keys()):
                         # Convert MongoDB operators to SQL
                         for op, val in value.items():
-                            if op == '$lt':
-                                normalized[f"{key} < ?"] = val
-                            elif op == '$lte':
-                                normalized[f"{key} <= ?"] = val
-                            elif op == '$gt':
-                                normalized[f"{key} > ?"] = val
-                            elif op == '$gte':
-                                normalized[f"{key} >= ?"] = val
-                            elif op == '$ne':
-                                normalized[f"{key} != ?"] = val
-                            elif op == '$in':
-                                normalized[f"{key} IN ?"] = tuple(val)
-                            elif op == '$nin':
-                                normalized[f"{key} NOT IN ?"] = tuple(val)
+                            sql_op = _SQL_OPERATORS.get(op)
+                            if sql_op is not None:
+                                normalized[f"{key} {sql_op} ?"] = tuple(val) if op in ('$in', '$nin') else val
                     else:
                         # Handle normal key-value pairs
                         if isinstance(value, ObjectId):
@@ -281,6 +281,27 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         result = cls.normalise(cast(Dict[str, Any], DBMS.Database.find_one(cls.table_name(), cls.normalise({'id': id}, 'params'))))
         return cls(**result) if result else None
     
+    @classmethod
+    def get_many(cls, ids: List[Union[str, int, ObjectId]]) -> List[Self]:
+        """Get model instances for several IDs, in the order given; missing IDs are skipped.
+        
+        Backends with find_in (SQLite, MongoDB) fetch them in one query, others one by one.
+        """
+        if DBMS.Database is None:
+            raise RuntimeError("Database not initialized")
+        if not hasattr(DBMS.Database, 'find_in'):
+            return [instance for instance in (cls.get(id) for id in ids) if instance is not None]
+        
+        column = '_id' if DBMS.Database.dbms == 'mongodb' else 'id'
+        rows = DBMS.Database.find_in(cls.table_name(), column, ids)
+        return cls._in_id_order(ids, [cls(**cls.normalise(row)) for row in rows])
+    
+    @staticmethod
+    def _in_id_order(ids: List[Any], instances: List[Any]) -> List[Any]:
+        """Order instances fetched by ID like ids, dropping IDs that were not found."""
+        by_id = {str(instance.id): instance for instance in instances}
+        return [by_id[str(id)] for id in ids if str(id) in by_id]
+    
     @classmethod
     def get_related(cls, instance_id: str, relationship: str):
         """Get related objects for a relationship."""
@@ -371,15 +392,11 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         for hook in hooks:
             await hook(self)
     
-    async def save_async(self) -> Self:
-        '''Save the model instance to database asynchronously.'''
-        # Run async before_save hooks
-        await self._run_hooks_async(self._before_save_hooks_async)
-        
-        # Run sync before_save hooks in a thread pool
-        if self._before_save_hooks:
-            await asyncio.get_event_loop().run_in_executor(None, self._run_hooks, self._before_save_hooks)
+    def _save_data(self, updated_at: datetime) -> Dict[str, Any]:
+        """Validate the instance, stamp updated_at and build the data to save.
         
+        Relationship fields are replaced by their stored id or ids.
+        """
         # Validate fields
         self.validate_fields()
         
@@ -387,7 +404,7 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         self.compute_fields()
         
         # Update timestamps
-        self.updated_at = datetime.now()
+        self.updated_at = updated_at
         
         # Prepare data for save
         data = self.model_dump()
@@ -403,6 +420,28 @@ class Model(BaseModel, metaclass=ModelMetaclass):
                 if name in data:
                     del data[name]
         
+        return data
+    
+    def _insert_row(self, updated_at: datetime) -> Dict[str, Any]:
+        """Build the normalised row a bulk insert writes for this instance."""
+        row = self.normalise(self._save_data(updated_at), 'params')
+        # SQL backends assign auto-increment ids; drop the generated string id as insert does
+        if DBMS.Database.dbms != 'mongodb' and isinstance(row.get('id'), str):
+            del row['id']
+        return row
+    
+    async def save_async(self) -> Self:
+        '''Save the model instance to database asynchronously.'''
+        # Run async before_save hooks
+        await self._run_hooks_async(self._before_save_hooks_async)
+        
+        # Run sync before_save hooks in a thread pool
+        if self._before_save_hooks:
+            await asyncio.to_thread(self._run_hooks, self._before_save_hooks)
+        
+        # Validate, compute fields, update timestamps and prepare data for save
+        data = self._save_data(datetime.now())
+        
         # Check if this is a new record or existing one
         existing = None
         if self.id and not isinstance(self.id, ObjectId):
@@ -434,10 +473,39 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         
         # Run sync after_save hooks in a thread pool
         if self._after_save_hooks:
-            await asyncio.get_event_loop().run_in_executor(None, self._run_hooks, self._after_save_hooks)
+            await asyncio.to_thread(self._run_hooks, self._after_save_hooks)
         
         return self
     
+    @classmethod
+    async def bulk_save_async(cls, instances: List[Self]) -> int:
+        """Insert new instances with one insert_many_async call asynchronously.
+        
+        Hooks, validation and computed fields run per instance, and all rows share one
+        updated_at timestamp. Ids generated by SQL databases are not written back.
+        """
+        if DBMS.Database is None:
+            raise RuntimeError("Database not initialized")
+        if not instances:
+            return 0
+        
+        now = datetime.now()
+        rows = []
+        for instance in instances:
+            await instance._run_hooks_async(instance._before_save_hooks_async)
+            if instance._before_save_hooks:
+                await asyncio.to_thread(instance._run_hooks, instance._before_save_hooks)
+            rows.append(instance._insert_row(now))
+        
+        result = await DBMS.Database.insert_many_async(cls.table_name(), rows)
+        
+        for instance in instances:
+            await instance._run_hooks_async(instance._after_save_hooks_async)
+            if instance._after_save_hooks:
+                await asyncio.to_thread(instance._run_hooks, instance._after_save_hooks)
+        
+        return result
+    
     @classmethod
     async def get_async(cls, id: Union[str, int, ObjectId]) -> Optional[Self]:
         """Get a model instance by ID asynchronously."""
@@ -447,6 +515,19 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         result = cls.normalise(cast(Dict[str, Any], await DBMS.Database.find_one_async(cls.table_name(), cls.normalise({'id': id}, 'params'))))
         return cls(**result) if result else None
     
+    @classmethod
+    async def get_many_async(cls, ids: List[Union[str, int, ObjectId]]) -> List[Self]:
+        """Get model instances for several IDs asynchronously, in the order given."""
+        if DBMS.Database is None:
+            raise RuntimeError("Database not initialized")
+        if not hasattr(DBMS.Database, 'find_in_async'):
+            instances = await asyncio.gather(*[cls.get_async(id) for id in ids])
+            return [instance for instance in instances if instance is not None]
+        
+        column = '_id' if DBMS.Database.dbms == 'mongodb' else 'id'
+        rows = await DBMS.Database.find_in_async(cls.table_name(), column, ids)
+        return cls._in_id_order(ids, [cls(**cls.normalise(row)) for row in rows])
+    
     @classmethod
     async def get_related_async(cls, instance_id: str, relationship: str):
         """Get related objects for a relationship asynchronously."""
@@ -473,7 +554,7 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         
         # Run sync before_delete hooks in a thread pool
         if self._before_delete_hooks:
-            await asyncio.get_event_loop().run_in_executor(None, self._run_hooks, self._before_delete_hooks)
+            await asyncio.to_thread(self._run_hooks, self._before_delete_hooks)
         
         if cascade:
             # Delete related objects
@@ -494,7 +575,7 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         
         # Run sync after_delete hooks in a thread pool
         if self._after_delete_hooks:
-            await asyncio.get_event_loop().run_in_executor(None, self._run_hooks, self._after_delete_hooks)
+            await asyncio.to_thread(self._run_hooks, self._after_delete_hooks)
         
         return result
     
@@ -629,28 +710,8 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         # Run before_save hooks
         self._run_hooks(self._before_save_hooks)
         
-        # Validate fields
-        self.validate_fields()
-        
-        # Compute fields
-        self.compute_fields()
-        
-        # Update timestamps
-        self.updated_at = datetime.now()
-        
-        # Prepare data for save
-        data = self.model_dump()
-        
-        # Handle relationships
-        for name, field in self._fields.items():
-            if isinstance(field, RelationshipField):
-                if isinstance(field, (OneToMany, ManyToMany)):
-                    data[f'{name}_ids'] = getattr(self, f'_{name}_ids', [])
-                else:
-                    data[f'{name}_id'] = getattr(self, f'_{name}_id')
-                
-                if name in data:
-                    del data[name]
+        # Validate, compute fields, update timestamps and prepare data for save
+        data = self._save_data(datetime.now())
         
         # Check if this is a new record or existing one
         existing = None
@@ -682,3 +743,28 @@ class Model(BaseModel, metaclass=ModelMetaclass):
         self._run_hooks(self._after_save_hooks)
         
         return self
+    
+    @classmethod
+    def bulk_save(cls, instances: List[Self]) -> int:
+        """Insert new instances with one insert_many call.
+        
+        Hooks, validation and computed fields run per instance, and all rows share one
+        updated_at timestamp. Ids generated by SQL databases are not written back.
+        """
+        if DBMS.Database is None:
+            raise RuntimeError("Database not initialized")
+        if not instances:
+            return 0
+        
+        now = datetime.now()
+        rows = []
+        for instance in instances:
+            instance._run_hooks(instance._before_save_hooks)
+            rows.append(instance._insert_row(now))
+        
+        result = DBMS.Database.insert_many(cls.table_name(), rows)
+        
+        for instance in instances:
+            instance._run_hooks(instance._after_save_hooks)
+        
+        return result
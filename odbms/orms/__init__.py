@@ -1,5 +1,16 @@
-from .mongodb import MongoDB
-from .sqlitedb import SQLiteDB
-from .postgresqldb import PostgresqlDB
+from importlib import import_module
 
-__all__ = ['MongoDB', 'SQLiteDB', 'PostgresqlDB']
\ No newline at end of file
+__all__ = ['MongoDB', 'SQLiteDB', 'PostgresqlDB', 'PostgresqlDBSync']
+
+# Backends load on first access so a missing driver only fails when that backend is used
+_BACKENDS = {
+    'MongoDB': '.mongodb',
+    'SQLiteDB': '.sqlitedb',
+    'PostgresqlDB': '.postgresqldb',
+    'PostgresqlDBSync': '.postgresqldb',
+}
+
+def __getattr__(name):
+    if name in _BACKENDS:
+        return getattr(import_module(_BACKENDS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
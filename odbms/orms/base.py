@@ -1,9 +1,97 @@
-from typing import Any, List, Dict, Union
+from typing import Any, List, Dict, Union, Optional, Tuple, Callable
+from collections import OrderedDict
+import re
+import time
+import logging
+from itertools import chain
+from operator import itemgetter
 from contextlib import contextmanager
 
+logger = logging.getLogger(__name__)
+
+# SQL text keyed by statement shape (operation, table, column names, ...)
+_SQL_CACHE: Dict[tuple, str] = {}
+
+def cached_sql(key: tuple, build: Callable[[], str]) -> str:
+    """Return the SQL for a statement shape, building it on first use."""
+    sql = _SQL_CACHE.get(key)
+    if sql is None:
+        sql = _SQL_CACHE[key] = build()
+    return sql
+
+# Plain or schema-qualified SQL identifier
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_$]*(\.[A-Za-z_][A-Za-z0-9_$]*)?')
+
+def check_identifiers(*names: str) -> None:
+    """Raise ValueError unless every name is a plain SQL identifier (or '*')."""
+    for name in names:
+        if name != '*' and not _IDENTIFIER.fullmatch(name):
+            raise ValueError(f"Invalid SQL identifier: {name!r}")
+
+def checked_sql(key: tuple, build: Callable[[], str]) -> str:
+    """Like cached_sql, but validate the names in key the first time a shape is seen.
+    
+    key is (tag, table, ...) where later parts are names or tuples of names, so
+    identifiers are checked once per shape instead of on every call.
+    """
+    sql = _SQL_CACHE.get(key)
+    if sql is None:
+        for part in key[1:]:
+            names = part if isinstance(part, tuple) else (part,)
+            check_identifiers(*[name for name in names if isinstance(name, str)])
+        sql = _SQL_CACHE[key] = build()
+    return sql
+
+def multi_row_insert(table: str, columns: tuple, rows: List[dict]) -> Tuple[str, list]:
+    """Build one multi-row INSERT and its flattened parameter list."""
+    row_placeholder = cached_sql(('row_placeholder', len(columns)), lambda: (
+        '(' + ', '.join(['%s'] * len(columns)) + ')'
+    ))
+    values = (row_placeholder + ', ') * (len(rows) - 1) + row_placeholder
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + values
+    return sql, list(chain.from_iterable(row_tuples(columns, rows)))
+
+def row_tuples(columns: tuple, rows: List[dict]) -> List[tuple]:
+    """Convert dict rows to positional tuples in column order."""
+    # itemgetter pulls each row's values in C; a single column yields a scalar, not a tuple
+    getter = itemgetter(*columns)
+    if len(columns) == 1:
+        return [(value,) for value in map(getter, rows)]
+    return list(map(getter, rows))
+
+class _hybridmethod:
+    """Bind to the instance when called on one, else to the class.
+    
+    Instance-based ORMs and classmethod-based backends (where the class is the
+    connection) then share one implementation with per-owner state.
+    """
+    def __init__(self, func: Callable):
+        self.func = func
+    
+    def __get__(self, obj: Any, owner: type) -> Callable:
+        return self.func.__get__(owner if obj is None else obj)
+
+def _copy_result(value: Any) -> Any:
+    """Copy a cached row or list of rows so callers cannot mutate the cache."""
+    if isinstance(value, list):
+        return [dict(row) if isinstance(row, dict) else row for row in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
 class ORM:
     db: Any
     dbms: str
+    
+    # Rows per multi-row INSERT statement in insert_many
+    insert_chunk_size: int = 1000
+    
+    # Opt-in (cache=True) query-result cache: per-owner, per-table LRU of read
+    # results, dropped on writes through the same owner
+    cache_size: int = 128
+    
+    # Seconds an approximate row count from catalog statistics is reused
+    approximate_count_ttl: float = 60.0
 
     def initialize(self, *args, **kwargs):
         pass
@@ -20,27 +108,127 @@ class ORM:
             # MongoDB already manages its own connections
             yield self.db
 
-    def _execute_sql(self, conn, sql: str, params: tuple = (), fetch: bool = True):
-        """Execute SQL with proper cursor management."""
+    @classmethod
+    def _cache_key(cls, op: str, filter: dict, projection: Union[List, Dict] = []) -> Optional[Tuple]:
+        """Build a hashable cache key, or None if the arguments are unhashable."""
+        if cls.cache_size <= 0:
+            return None
+        try:
+            key = (op, frozenset(filter.items()), tuple(projection) if isinstance(projection, list) else None)
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @_hybridmethod
+    def _own_state(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Return this instance's (or backend class's) own state attribute, created on first use.
+        
+        State is never inherited, so two connections or backends never share it.
+        """
+        state = vars(self).get(name)
+        if state is None:
+            state = factory()
+            setattr(self, name, state)
+        return state
+
+    @_hybridmethod
+    def _result_cache(self) -> Dict[str, OrderedDict]:
+        """This owner's result cache: table -> LRU of results."""
+        return self._own_state('_cache', dict)
+
+    @_hybridmethod
+    def _approx_count_get(self, table: str) -> Optional[int]:
+        """Return this owner's unexpired approximate row count for table, if any."""
+        cached = self._own_state('_approx_counts', dict).get(table)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+
+    @_hybridmethod
+    def _approx_count_set(self, table: str, rows: int) -> int:
+        """Keep an approximate row count for approximate_count_ttl seconds and return it."""
+        self._own_state('_approx_counts', dict)[table] = (time.monotonic() + self.approximate_count_ttl, rows)
+        return rows
+
+    @_hybridmethod
+    def _cache_get(self, table: str, key: Optional[Tuple]) -> Any:
+        """Return a copy of the cached result for table/key, or None on a miss.
+        
+        Only writes made through this owner invalidate entries; changes from
+        other processes or backend objects are not seen.
+        """
+        entries = self._result_cache().get(table)
+        if key is None or entries is None or key not in entries:
+            return None
+        entries.move_to_end(key)
+        return _copy_result(entries[key])
+
+    @_hybridmethod
+    def _cache_set(self, table: str, key: Optional[Tuple], value: Any) -> Any:
+        """Store a copy of a result in the table's LRU and return the result."""
+        if key is not None:
+            entries = self._result_cache().setdefault(table, OrderedDict())
+            entries[key] = _copy_result(value)
+            if len(entries) > self.cache_size:
+                entries.popitem(last=False)
+        return value
+
+    @_hybridmethod
+    def _invalidate(self, table: Optional[str] = None):
+        """Drop cached results for a table, or for every table if none is given."""
+        if table is None:
+            self._result_cache().clear()
+        else:
+            self._result_cache().pop(table, None)
+
+    @staticmethod
+    def _where_clause(keys: tuple) -> str:
+        """Build a parameterized WHERE clause over keys, or an empty string for none."""
+        if not keys:
+            return ''
+        return ' WHERE ' + ' AND '.join([f'{k} = %s' for k in keys])
+
+    def _check_projection(self, table: str, projection: Optional[Union[List, Dict]]) -> Union[List, Dict]:
+        """Log at debug level when a query falls back to SELECT *."""
+        if projection is None:
+            logger.debug("Query on '%s' has no projection and selects every column", table)
+            return []
+        return projection
+
+    @staticmethod
+    def _projection(projection: Union[List, Dict]) -> str:
+        """Build the SELECT column list for a projection."""
+        return ', '.join(projection) if isinstance(projection, list) and projection else '*'
+
+    def _execute_sql(self, conn, sql: str, params: tuple = (), fetch: bool = True, op: str = 'select'):
+        """Execute SQL with proper cursor management.
+        
+        op is one of 'select', 'insert', 'update' or 'delete' and tells whether
+        to fetch rows or commit, without inspecting the SQL text.
+        """
         cursor = conn.cursor()
         cursor.execute(sql, params)
         
-        if fetch and sql.lower().strip().startswith(('select', 'show')):
+        if fetch and op == 'select':
             return cursor.fetchall()
         
         conn.commit()
-        return cursor.lastrowid if sql.lower().strip().startswith('insert') else None
+        return cursor.lastrowid if op == 'insert' else None
 
     def insert(self, table: str, data: dict):
         """Insert a single record."""
         if self.dbms == 'mongodb':
             return self.db[table].insert_one(data)
         
+        columns = tuple(sorted(data))
         with self.get_connection() as conn:
-            placeholders = ', '.join(['%s'] * len(data))
-            columns = ', '.join(data.keys())
-            sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
-            return self._execute_sql(conn, sql, tuple(data.values()))
+            sql = cached_sql(('insert', table, columns), lambda: (
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+            ))
+            result = self._execute_sql(conn, sql, tuple(data[k] for k in columns), op='insert')
+            self._invalidate(table)
+            return result
 
     def insert_many(self, table: str, data: List[dict]):
         """Insert multiple records."""
@@ -50,47 +238,76 @@ class ORM:
         if not data:
             return None
             
+        columns = tuple(sorted(data[0]))
         with self.get_connection() as conn:
-            placeholders = ', '.join(['%s'] * len(data[0]))
-            columns = ', '.join(data[0].keys())
-            sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
             cursor = conn.cursor()
-            cursor.executemany(sql, [tuple(item.values()) for item in data])
+            total = 0
+            for start in range(0, len(data), self.insert_chunk_size):
+                chunk = data[start:start + self.insert_chunk_size]
+                sql, params = multi_row_insert(table, columns, chunk)
+                cursor.execute(sql, params)
+                total += cursor.rowcount
             conn.commit()
-            return cursor.lastrowid
+            self._invalidate(table)
+            return total
 
-    def find(self, table: str, filter: dict = {}, projection: Union[List, Dict] = []):
-        """Find all matching records."""
+    def find(self, table: str, filter: dict = {}, projection: Optional[Union[List, Dict]] = None, cache: bool = False):
+        """Find all matching records.
+        
+        With cache=True the result is served from and stored in a per-table LRU
+        that is dropped on writes through this instance.
+        """
         if self.dbms == 'mongodb':
             return self.db[table].find(filter, projection)
         
+        projection = self._check_projection(table, projection)
+        key = self._cache_key('find', filter, projection) if cache else None
+        cached = self._cache_get(table, key)
+        if cached is not None:
+            return cached
+        
+        keys = tuple(sorted(filter))
         with self.get_connection() as conn:
-            where_clause = ' AND '.join([f"{k} = %s" for k in filter.keys()]) if filter else '1=1'
-            proj_str = ', '.join(projection) if isinstance(projection, list) and projection else '*'
-            sql = f"SELECT {proj_str} FROM {table} WHERE {where_clause}"
-            return self._execute_sql(conn, sql, tuple(filter.values()))
+            sql = cached_sql(
+                ('find', table, keys, tuple(projection) if isinstance(projection, list) else None),
+                lambda: f"SELECT {self._projection(projection)} FROM {table}{self._where_clause(keys)}"
+            )
+            results = self._execute_sql(conn, sql, tuple(filter[k] for k in keys))
+            return self._cache_set(table, key, results)
 
-    def find_one(self, table: str, filter: dict = {}, projection: Union[List, Dict] = []):
-        """Find a single record."""
+    def find_one(self, table: str, filter: dict = {}, projection: Optional[Union[List, Dict]] = None, cache: bool = False):
+        """Find a single record, see find for cache."""
         if self.dbms == 'mongodb':
             return self.db[table].find_one(filter, projection)
         
+        projection = self._check_projection(table, projection)
+        key = self._cache_key('find_one', filter, projection) if cache else None
+        cached = self._cache_get(table, key)
+        if cached is not None:
+            return cached
+        
+        keys = tuple(sorted(filter))
         with self.get_connection() as conn:
-            where_clause = ' AND '.join([f"{k} = %s" for k in filter.keys()]) if filter else '1=1'
-            proj_str = ', '.join(projection) if isinstance(projection, list) and projection else '*'
-            sql = f"SELECT {proj_str} FROM {table} WHERE {where_clause} LIMIT 1"
-            results = self._execute_sql(conn, sql, tuple(filter.values()))
-            return results[0] if results else None
+            sql = cached_sql(
+                ('find_one', table, keys, tuple(projection) if isinstance(projection, list) else None),
+                lambda: f"SELECT {self._projection(projection)} FROM {table}{self._where_clause(keys)} LIMIT 1"
+            )
+            results = self._execute_sql(conn, sql, tuple(filter[k] for k in keys))
+            return self._cache_set(table, key, results[0]) if results else None
 
     def remove(self, table: str, filter: dict):
         """Remove matching records."""
         if self.dbms == 'mongodb':
             return self.db[table].delete_many(filter)
         
+        keys = tuple(sorted(filter))
         with self.get_connection() as conn:
-            where_clause = ' AND '.join([f"{k} = %s" for k in filter.keys()])
-            sql = f"DELETE FROM {table} WHERE {where_clause}"
-            return self._execute_sql(conn, sql, tuple(filter.values()), fetch=False)
+            sql = cached_sql(('remove', table, keys), lambda: (
+                f"DELETE FROM {table} WHERE {' AND '.join([f'{k} = %s' for k in keys])}"
+            ))
+            result = self._execute_sql(conn, sql, tuple(filter[k] for k in keys), fetch=False, op='delete')
+            self._invalidate(table)
+            return result
 
     def delete(self, table: str, filter: dict):
         """Alias for remove."""
@@ -101,41 +318,78 @@ class ORM:
         if self.dbms == 'mongodb':
             return self.db[table].update_many(filter, {'$set': data})
         
+        columns = tuple(sorted(data))
+        keys = tuple(sorted(filter))
         with self.get_connection() as conn:
-            set_clause = ', '.join([f"{k} = %s" for k in data.keys()])
-            where_clause = ' AND '.join([f"{k} = %s" for k in filter.keys()])
-            sql = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
-            return self._execute_sql(conn, sql, tuple(data.values()) + tuple(filter.values()), fetch=False)
+            sql = cached_sql(('update', table, columns, keys), lambda: (
+                f"UPDATE {table} SET {', '.join([f'{k} = %s' for k in columns])} "
+                f"WHERE {' AND '.join([f'{k} = %s' for k in keys])}"
+            ))
+            params = tuple(data[k] for k in columns) + tuple(filter[k] for k in keys)
+            result = self._execute_sql(conn, sql, params, fetch=False, op='update')
+            self._invalidate(table)
+            return result
 
     def update_many(self, table: str, filter: dict, data: dict):
         """Alias for update as it handles multiple records by default."""
         return self.update(table, filter, data)
 
-    def count(self, table: str, filter: dict = {}):
-        """Count matching records."""
+    def count(self, table: str, filter: dict = {}, approximate: bool = False, cache: bool = False):
+        """Count matching records.
+        
+        With approximate=True and no filter, the count is read from the server's
+        table statistics instead of scanning the table, and kept for
+        approximate_count_ttl seconds. See find for cache.
+        """
         if self.dbms == 'mongodb':
+            if approximate and not filter:
+                return self.db[table].estimated_document_count()
             return self.db[table].count_documents(filter)
         
+        if approximate and not filter:
+            cached = self._approx_count_get(table)
+            if cached is not None:
+                return cached
+            
+            with self.get_connection() as conn:
+                if self.dbms == 'postgresql':
+                    sql = "SELECT reltuples::bigint AS count FROM pg_class WHERE relname = %s"
+                else:
+                    sql = ("SELECT table_rows AS count FROM information_schema.tables "
+                           "WHERE table_schema = DATABASE() AND table_name = %s")
+                results = self._execute_sql(conn, sql, (table,))
+            if results:
+                return self._approx_count_set(table, int(results[0]['count'] or 0))
+        
+        key = self._cache_key('count', filter) if cache else None
+        cached = self._cache_get(table, key)
+        if cached is not None:
+            return cached
+        
+        keys = tuple(sorted(filter))
         with self.get_connection() as conn:
-            where_clause = ' AND '.join([f"{k} = %s" for k in filter.keys()]) if filter else '1=1'
-            sql = f"SELECT COUNT(*) as count FROM {table} WHERE {where_clause}"
-            results = self._execute_sql(conn, sql, tuple(filter.values()))
-            return results[0]['count'] if results else 0
+            sql = cached_sql(('count', table, keys), lambda: (
+                f"SELECT COUNT(*) as count FROM {table}{self._where_clause(keys)}"
+            ))
+            results = self._execute_sql(conn, sql, tuple(filter[k] for k in keys))
+            return self._cache_set(table, key, results[0]['count'] if results else 0)
 
-    def sum(self, table: str, column: str, params: dict = {}):
+    def sum(self, table: str, column: str, params: Optional[dict] = None):
         """Sum values in a column."""
         if self.dbms == 'mongodb':
             pipeline = [
-                {'$match': params},
+                {'$match': params or {}},
                 {'$group': {'_id': None, 'total': {'$sum': f'${column}'}}}
             ]
             result = list(self.db[table].aggregate(pipeline))
             return result[0]['total'] if result else 0
         
+        keys = tuple(sorted(params)) if params else ()
         with self.get_connection() as conn:
-            where_clause = ' AND '.join([f"{k} = %s" for k in params.keys()]) if params else '1=1'
-            sql = f"SELECT SUM({column}) as total FROM {table} WHERE {where_clause}"
-            results = self._execute_sql(conn, sql, tuple(params.values()))
+            sql = cached_sql(('sum', table, column, keys), lambda: (
+                f"SELECT SUM({column}) as total FROM {table}{self._where_clause(keys)}"
+            ))
+            results = self._execute_sql(conn, sql, tuple(params[k] for k in keys))
             return results[0]['total'] if results else 0
 
     def execute(self, query: str, params: tuple = ()):
@@ -143,8 +397,17 @@ class ORM:
         if self.dbms == 'mongodb':
             return None  # MongoDB doesn't support SQL
         
+        # Classify the statement from its leading keyword only
+        verb = query.lstrip()[:6].lower()
+        op = 'select' if verb.startswith(('select', 'show')) else 'insert' if verb == 'insert' else 'update'
+        
         with self.get_connection() as conn:
-            return self._execute_sql(conn, query, params)
+            result = self._execute_sql(conn, query, params, op=op)
+        
+        # Raw statements may touch any table, so drop the whole cache on writes
+        if op != 'select':
+            self._invalidate()
+        return result
 
     def import_from_file(self, filename: str):
         """Import data from a file."""
@@ -1,19 +1,47 @@
 from typing import Dict, List, Any, Optional, Union
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+import csv
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pymongo import MongoClient, InsertOne, UpdateOne, UpdateMany, DeleteOne, DeleteMany
+from pymongo.database import Database as PyMongoDatabase
 from bson import ObjectId
 
 from ..database import Database
 
+_OID_HEX_LEN = 24
+
+# bulk() request shorthands: op name -> (pymongo request class, takes a filter)
+_BULK_OPS = {
+    'insert': (InsertOne, False),
+    'update': (UpdateMany, True),
+    'update_one': (UpdateOne, True),
+    'remove': (DeleteMany, True),
+    'remove_one': (DeleteOne, True),
+}
+
+def _to_object_id(value: Any) -> ObjectId:
+    """Convert a value to ObjectId, decoding canonical hex strings directly."""
+    if isinstance(value, ObjectId):
+        return value
+    if isinstance(value, str) and len(value) == _OID_HEX_LEN:
+        try:
+            return ObjectId(bytes.fromhex(value))
+        except ValueError:
+            pass
+    return ObjectId(value)
+
 class MongoDB(Database):
     """MongoDB database implementation."""
     
+    # Process-wide clients keyed by their full connection settings; each is its own pool
+    _clients: Dict[str, MongoClient] = {}
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.dbms = 'mongodb'
-        self.client: Optional[AsyncIOMotorClient] = None
-        self.db: Optional[AsyncIOMotorDatabase] = None
-        self._loop = None
+        self.client: Optional[MongoClient] = None
+        self.db: Optional[PyMongoDatabase] = None
     
     def _convert_id(self, conditions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Convert string _id to ObjectId."""
@@ -21,131 +49,268 @@ class MongoDB(Database):
             return {}
         
         conditions = conditions.copy()
-        if '_id' in conditions and not isinstance(conditions['_id'], ObjectId):
-            conditions['_id'] = ObjectId(conditions['_id'])
+        if '_id' in conditions:
+            value = conditions['_id']
+            if isinstance(value, dict):
+                value = value.copy()
+                for op in ('$in', '$nin'):
+                    if op in value:
+                        value[op] = [_to_object_id(x) for x in value[op]]
+                conditions['_id'] = value
+            else:
+                conditions['_id'] = _to_object_id(value)
         return conditions
 
     def connect(self):
-        """Connect to MongoDB."""
-        host = self.config.get('host', 'localhost')
-        port = self.config.get('port', 27017)
-        database = self.config['database']
+        """Connect to MongoDB, reusing the shared client for identical connection settings."""
+        # Everything but the database name configures the client, so the whole
+        # set (credentials, authSource, TLS and pool options included) is the key
+        options = {k: v for k, v in self.config.items() if k not in ('database', 'dbms', 'pool_min', 'pool_max')}
+        options['host'] = options.get('host') or 'localhost'
+        options['port'] = int(options.get('port') or 27017)
+        options.setdefault('maxPoolSize', self.config.get('pool_max', 50))
+        options.setdefault('minPoolSize', self.config.get('pool_min', 5))
+        options.setdefault('uuidRepresentation', 'standard')
         
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        self.client = AsyncIOMotorClient(host=host, port=port)
-        self.db = self.client[database]
+        key = repr(sorted(options.items()))
+        client = MongoDB._clients.get(key)
+        if client is None:
+            client = MongoDB._clients.setdefault(key, MongoClient(**options))
+        self.client = client
+        self.db = self.client[self.config['database']]
     
     def disconnect(self):
-        """Disconnect from MongoDB."""
-        if self.client is not None:
-            self.client.close()
-            self.client = None
-            self.db = None
-        if self._loop is not None:
-            self._loop.close()
-            self._loop = None
-    
-    def _run_sync(self, coro):
-        """Run coroutine synchronously."""
-        if self._loop is None or self._loop.is_closed():
-            self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-        try:
-            return self._loop.run_until_complete(coro)
-        except RuntimeError as e:
-            if "Event loop is closed" in str(e):
-                # Create new event loop and retry
-                self._loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(self._loop)
-                return self._loop.run_until_complete(coro)
-            raise
-    
-    def find(self, table: str, conditions: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Find records matching conditions."""
+        """Detach from MongoDB; the shared client stays open until close_all()."""
+        self.client = None
+        self.db = None
+    
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every shared MongoClient."""
+        clients, cls._clients = cls._clients, {}
+        for client in clients.values():
+            client.close()
+    
+    def find(self, table: str, conditions: Optional[Dict[str, Any]] = None,
+             projection: Optional[Union[Dict[str, Any], List[str]]] = None,
+             batch_size: int = 0, limit: int = 0) -> List[Dict[str, Any]]:
+        """Find records matching conditions.
+        
+        `projection` limits the fields the server sends back, `batch_size`
+        sets documents per getMore round trip and `limit` caps the result.
+        """
+        if self.db is None:
+            raise RuntimeError("Database not connected")
         conditions = self._convert_id(conditions)
-        return self._run_sync(self.find_async(table, conditions))
+        cursor = self.db[table].find(conditions, projection)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+    
+    def find_in(self, table: str, column: str, values: List[Any]) -> List[Dict[str, Any]]:
+        """Find records whose column matches any of values, in one $in query."""
+        return self.find(table, {column: {'$in': list(values)}})
     
     def find_one(self, table: str, conditions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Find a single record matching conditions."""
+        if self.db is None:
+            raise RuntimeError("Database not connected")
         conditions = self._convert_id(conditions)
-        return self._run_sync(self.find_one_async(table, conditions))
+        return self.db[table].find_one(conditions)
     
     def insert(self, table: str, data: Dict[str, Any]) -> Any:
         """Insert a record."""
-        return self._run_sync(self.insert_async(table, data))
+        if self.db is None:
+            raise RuntimeError("Database not connected")
+        result = self.db[table].insert_one(data)
+        return str(result.inserted_id)
     
     def insert_many(self, table: str, data: List[Dict[str, Any]]) -> int:
         """Insert multiple records."""
-        return self._run_sync(self.insert_many_async(table, data))
-    
-    def update(self, table: str, conditions: Dict[str, Any], data: Dict[str, Any]) -> int:
-        """Update records matching conditions."""
-        return self._run_sync(self.update_async(table, conditions, data))
-    
-    def remove(self, table: str, conditions: Dict[str, Any]) -> int:
-        """Remove records matching conditions."""
-        return self._run_sync(self.remove_async(table, conditions))
-    
-    def sum(self, table: str, column: str, conditions: Optional[Dict[str, Any]] = None) -> Union[int, float]:
-        """Sum values in a column."""
-        return self._run_sync(self.sum_async(table, column, conditions))
-
-    async def find_async(self, table: str, conditions: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Find records matching conditions asynchronously."""
         if self.db is None:
             raise RuntimeError("Database not connected")
-        conditions = self._convert_id(conditions)
-        cursor = self.db[table].find(conditions)
-        return await cursor.to_list(length=None)
+        result = self.db[table].insert_many(data)
+        return len(result.inserted_ids)
     
-    async def find_one_async(self, table: str, conditions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Find a single record matching conditions asynchronously."""
+    def update(self, table: str, conditions: Dict[str, Any], data: Dict[str, Any], upsert: bool = False) -> int:
+        """Update records matching conditions, inserting one if none match and upsert is set."""
         if self.db is None:
             raise RuntimeError("Database not connected")
         conditions = self._convert_id(conditions)
-        return await self.db[table].find_one(conditions)
+        result = self.db[table].update_many(conditions, {'$set': data}, upsert=upsert)
+        return result.modified_count
     
-    async def insert_async(self, table: str, data: Dict[str, Any]) -> Any:
-        """Insert a record asynchronously."""
+    def remove(self, table: str, conditions: Dict[str, Any]) -> int:
+        """Remove records matching conditions."""
         if self.db is None:
             raise RuntimeError("Database not connected")
-        result = await self.db[table].insert_one(data)
-        return str(result.inserted_id)
+        conditions = self._convert_id(conditions)
+        result = self.db[table].delete_many(conditions)
+        return result.deleted_count
     
-    async def insert_many_async(self, table: str, data: List[Dict[str, Any]]) -> int:
-        """Insert multiple records asynchronously."""
+    def bulk(self, table: str, requests: List[Any], ordered: bool = False) -> Dict[str, int]:
+        """Send many writes to one collection in a single bulk_write.
+        
+        Requests are pymongo request objects (InsertOne, UpdateMany, ...) or dicts
+        like {'op': 'update', 'conditions': {...}, 'data': {...}}, where op is one of
+        insert, update, update_one, remove, remove_one and update data is $set.
+        Unordered by default so the server may apply them in parallel.
+        """
         if self.db is None:
             raise RuntimeError("Database not connected")
-        result = await self.db[table].insert_many(data)
-        return len(result.inserted_ids)
+        if not requests:
+            return {'inserted': 0, 'modified': 0, 'deleted': 0}
+        
+        operations = []
+        for request in requests:
+            if not isinstance(request, dict):
+                operations.append(request)
+                continue
+            try:
+                request_class, filtered = _BULK_OPS[request['op']]
+            except KeyError:
+                raise ValueError(f"Unsupported bulk operation: {request.get('op')!r}") from None
+            if not filtered:
+                operations.append(request_class(request['data']))
+            elif request_class in (DeleteOne, DeleteMany):
+                operations.append(request_class(self._convert_id(request.get('conditions'))))
+            else:
+                operations.append(request_class(self._convert_id(request.get('conditions')), {'$set': request['data']}))
+        
+        result = self.db[table].bulk_write(operations, ordered=ordered)
+        return {
+            'inserted': result.inserted_count,
+            'modified': result.modified_count,
+            'deleted': result.deleted_count,
+        }
     
-    async def update_async(self, table: str, conditions: Dict[str, Any], data: Dict[str, Any]) -> int:
-        """Update records matching conditions asynchronously."""
+    def bulk_clear(self, tables: List[str]) -> int:
+        """Delete every document in several collections, one concurrent delete_many each."""
         if self.db is None:
             raise RuntimeError("Database not connected")
-        conditions = self._convert_id(conditions)
-        result = await self.db[table].update_many(conditions, {'$set': data})
-        return result.modified_count
+        if not tables:
+            return 0
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            results = executor.map(lambda table: self.db[table].delete_many({}).deleted_count, tables)
+            return sum(results)
     
-    async def remove_async(self, table: str, conditions: Dict[str, Any]) -> int:
-        """Remove records matching conditions asynchronously."""
+    def batched_insert(self, table: str, data: List[Dict[str, Any]]) -> int:
+        """Insert records as one unordered bulk_write of InsertOne requests."""
+        return self.bulk(table, [InsertOne(document) for document in data])['inserted']
+    
+    def count(self, table: str, conditions: Optional[Dict[str, Any]] = None, approximate: bool = False) -> int:
+        """Count records matching conditions.
+        
+        With approximate=True and no conditions the count comes from collection
+        metadata (estimated_document_count) instead of a collection scan; it can
+        be off after an unclean shutdown or with orphaned documents on sharded
+        clusters.
+        """
         if self.db is None:
             raise RuntimeError("Database not connected")
-        conditions = self._convert_id(conditions)
-        result = await self.db[table].delete_many(conditions)
-        return result.deleted_count
+        if approximate and not conditions:
+            return self.db[table].estimated_document_count()
+        return self.db[table].count_documents(self._convert_id(conditions))
     
-    async def sum_async(self, table: str, column: str, conditions: Optional[Dict[str, Any]] = None) -> Union[int, float]:
-        """Sum values in a column asynchronously."""
+    def sum(self, table: str, column: str, conditions: Optional[Dict[str, Any]] = None,
+            hint: Optional[Union[str, List[Any]]] = None) -> Union[int, float]:
+        """Sum values in a column.
+        
+        Only the summed column is projected into the $group stage; pass `hint`
+        to force the index used by the $match stage.
+        """
         if self.db is None:
             raise RuntimeError("Database not connected")
         conditions = self._convert_id(conditions)
         pipeline = [
             {'$match': conditions or {}},
+            {'$project': {column: 1, '_id': 0}},
             {'$group': {'_id': None, 'total': {'$sum': f'${column}'}}}
         ]
         
-        result = await self.db[table].aggregate(pipeline).to_list(length=1)
+        options = {'hint': hint} if hint is not None else {}
+        result = list(self.db[table].aggregate(pipeline, **options))
         return float(result[0]['total']) if result else 0
 
+    def import_from_file(self, table: str, path: str, fmt: str = 'csv', chunk_size: int = 10000) -> int:
+        """Bulk load a CSV (with header) or JSON/JSON-lines file in insert_many chunks."""
+        if self.db is None:
+            raise RuntimeError("Database not connected")
+        
+        with open(path, newline='') as file:
+            if fmt == 'csv':
+                documents = csv.DictReader(file)
+            elif fmt == 'json':
+                first = file.read(1)
+                file.seek(0)
+                documents = json.load(file) if first == '[' else (json.loads(line) for line in file if line.strip())
+            else:
+                raise ValueError(f"Unsupported import format: {fmt}")
+            
+            total = 0
+            chunk: List[Dict[str, Any]] = []
+            for document in documents:
+                chunk.append(dict(document))
+                if len(chunk) >= chunk_size:
+                    total += len(self.db[table].insert_many(chunk).inserted_ids)
+                    chunk = []
+            if chunk:
+                total += len(self.db[table].insert_many(chunk).inserted_ids)
+        return total
+
+    async def find_async(self, table: str, conditions: Optional[Dict[str, Any]] = None,
+                         projection: Optional[Union[Dict[str, Any], List[str]]] = None,
+                         batch_size: int = 0, limit: int = 0) -> List[Dict[str, Any]]:
+        """Find records matching conditions asynchronously."""
+        return await asyncio.to_thread(self.find, table, conditions, projection, batch_size, limit)
+    
+    async def find_in_async(self, table: str, column: str, values: List[Any]) -> List[Dict[str, Any]]:
+        """Find records whose column matches any of values asynchronously."""
+        return await asyncio.to_thread(self.find_in, table, column, values)
+    
+    async def find_one_async(self, table: str, conditions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Find a single record matching conditions asynchronously."""
+        return await asyncio.to_thread(self.find_one, table, conditions)
+    
+    async def insert_async(self, table: str, data: Dict[str, Any]) -> Any:
+        """Insert a record asynchronously."""
+        return await asyncio.to_thread(self.insert, table, data)
+    
+    async def insert_many_async(self, table: str, data: List[Dict[str, Any]]) -> int:
+        """Insert multiple records asynchronously."""
+        return await asyncio.to_thread(self.insert_many, table, data)
+    
+    async def update_async(self, table: str, conditions: Dict[str, Any], data: Dict[str, Any], upsert: bool = False) -> int:
+        """Update records matching conditions asynchronously."""
+        return await asyncio.to_thread(self.update, table, conditions, data, upsert)
+    
+    async def remove_async(self, table: str, conditions: Dict[str, Any]) -> int:
+        """Remove records matching conditions asynchronously."""
+        return await asyncio.to_thread(self.remove, table, conditions)
+    
+    async def bulk_async(self, table: str, requests: List[Any], ordered: bool = False) -> Dict[str, int]:
+        """Send many writes in a single bulk_write asynchronously."""
+        return await asyncio.to_thread(self.bulk, table, requests, ordered)
+    
+    async def bulk_clear_async(self, tables: List[str]) -> int:
+        """Delete every document in several collections asynchronously."""
+        return await asyncio.to_thread(self.bulk_clear, tables)
+    
+    async def batched_insert_async(self, table: str, data: List[Dict[str, Any]]) -> int:
+        """Insert records in one unordered bulk_write asynchronously."""
+        return await asyncio.to_thread(self.batched_insert, table, data)
+    
+    async def count_async(self, table: str, conditions: Optional[Dict[str, Any]] = None, approximate: bool = False) -> int:
+        """Count records matching conditions asynchronously."""
+        return await asyncio.to_thread(self.count, table, conditions, approximate)
+    
+    async def sum_async(self, table: str, column: str, conditions: Optional[Dict[str, Any]] = None,
+                        hint: Optional[Union[str, List[Any]]] = None) -> Union[int, float]:
+        """Sum values in a column asynchronously."""
+        return await asyncio.to_thread(self.sum, table, column, conditions, hint)
+    
+    async def import_from_file_async(self, table: str, path: str, fmt: str = 'csv', chunk_size: int = 10000) -> int:
+        """Bulk load a file asynchronously."""
+        return await asyncio.to_thread(self.import_from_file, table, path, fmt, chunk_size)
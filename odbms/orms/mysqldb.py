@@ -1,81 +1,207 @@
 import logging
 import os
+import csv
 from sys import exit
-from typing import Dict, List, Any, Optional, Union, Type, cast
+from typing import Dict, List, Any, Optional, Union, Type, AsyncIterator, Tuple, cast
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import asyncio
 import aiomysql
-from aiomysql import Pool, Connection, DictCursor
+from aiomysql import Pool, Connection, SSCursor
+from pymysql.constants import CLIENT
 
-from .base import ORM
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+from .base import ORM, cached_sql, check_identifiers, multi_row_insert
+
+# Connection pinned by MysqlDB.pinned(); *_async calls in that context run on it
+_current_conn: ContextVar[Optional[Connection]] = ContextVar('odbms_mysql_conn', default=None)
+
+# Mongo-style comparison operators accepted in filters, mapped to SQL
+_FILTER_OPERATORS = {
+    '$eq': '=',
+    '$ne': '<>',
+    '$lt': '<',
+    '$lte': '<=',
+    '$gt': '>',
+    '$gte': '>=',
+}
 
 class MysqlDB(ORM):
     _db: Optional[Connection] = None
     _dbms: str = 'mysql'
     _pool: Optional[Pool] = None
+    _pool_ready: Optional[asyncio.Event] = None
     _loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    # Write coalescing for insert(..., batched=True)
+    batch_max_size: int = 500
+    batch_max_wait: float = 0.005
+    _write_queue: Optional[asyncio.Queue] = None
+    _writer_task: Optional[asyncio.Task] = None
+    
+    # Rows pulled per round trip when streaming SELECT results
+    fetch_chunk_size: int = 1000
+    
+    # Replace SELECT * with the table's explicit column list
+    expand_select_star: bool = False
+    _columns_cache: Dict[str, List[str]] = {}
+    
+    # Run parameterized statements through server-side PREPARE/EXECUTE
+    server_prepared: bool = False
+    _prepared: Dict[str, str] = {}
+    
+    # Set from dbsettings['multi_statements']; lets pipeline() send one round trip
+    _multi_statements: bool = False
+    
+    # Connection settings kept for dedicated (non-pooled) connections
+    _conn_settings: Dict[str, Any] = {}
 
     @classmethod
     def connect(cls, dbsettings: dict) -> None:
         '''Connection method'''
-        cls._loop = asyncio.new_event_loop()
+        cls._loop = cls._new_loop()
         asyncio.set_event_loop(cls._loop)
+        cls._loop.run_until_complete(cls._open_pool(dbsettings))
+    
+    @classmethod
+    async def connect_async(cls, dbsettings: dict) -> None:
+        """Create the pool on the running event loop; it is ready when this returns.
+        
+        Use the *_async API afterwards: the sync wrappers run on their own loop,
+        which cannot drive a pool bound to this one.
+        """
+        await cls._open_pool(dbsettings)
+    
+    @classmethod
+    async def _open_pool(cls, dbsettings: dict) -> None:
+        """Create and prewarm the pool, then set pool_ready()."""
+        pool_settings = {
+            'host': dbsettings.get('host', 'localhost'),
+            'port': dbsettings.get('port', 3306),
+            'user': dbsettings['user'],
+            'password': dbsettings['password'],
+            'minsize': dbsettings.get('pool_min', 5),
+            'maxsize': dbsettings.get('pool_max', 20),
+            'pool_recycle': dbsettings.get('pool_recycle', 3600),
+            'autocommit': True
+        }
+        if dbsettings.get('multi_statements'):
+            pool_settings['client_flag'] = CLIENT.MULTI_STATEMENTS
+        cls._multi_statements = bool(dbsettings.get('multi_statements'))
+        
+        cls._conn_settings = {
+            'host': pool_settings['host'],
+            'port': pool_settings['port'],
+            'user': pool_settings['user'],
+            'password': pool_settings['password'],
+            'db': dbsettings.get('database'),
+            'autocommit': True
+        }
         
         try:
-            cls._pool = cls._loop.run_until_complete(aiomysql.create_pool(
-                host=dbsettings.get('host', 'localhost'),
-                port=dbsettings.get('port', 3306),
-                user=dbsettings['user'],
-                password=dbsettings['password'],
+            cls._pool = await aiomysql.create_pool(
                 db=dbsettings.get('database'),
-                autocommit=True
-            ))
+                **pool_settings
+            )
         except Exception as e:
             if 'Unknown database' in str(e):
                 # Try connecting without database to create it
-                dbsettings = dbsettings.copy()
-                del dbsettings['database']
-                cls._pool = cls._loop.run_until_complete(aiomysql.create_pool(
-                    host=dbsettings.get('host', 'localhost'),
-                    port=dbsettings.get('port', 3306),
-                    user=dbsettings['user'],
-                    password=dbsettings['password'],
-                    autocommit=True
-                ))
+                cls._pool = await aiomysql.create_pool(**pool_settings)
             else:
                 print(str(e))
                 exit(1)
+        
+        await cls._prewarm(pool_settings['minsize'])
+        cls.pool_ready().set()
+    
+    @classmethod
+    def pool_ready(cls) -> asyncio.Event:
+        """Event that is set once connect() has a pool ready and cleared by disconnect()."""
+        if cls._pool_ready is None:
+            cls._pool_ready = asyncio.Event()
+        return cls._pool_ready
+    
+    @classmethod
+    async def _prewarm(cls, size: int) -> None:
+        """Eagerly open `size` pooled connections so early queries skip the handshake."""
+        if cls._pool is None or size <= 0:
+            return
+        conns = await asyncio.gather(*[cls._pool.acquire() for _ in range(size)])
+        for conn in conns:
+            cls._pool.release(conn)
     
     @classmethod
     def disconnect(cls) -> None:
         """Disconnect from MySQL."""
-        if cls._pool:
-            cls._pool.close()
-            if cls._loop:
-                cls._loop.run_until_complete(cls._pool.wait_closed())
+        pool = cls._detach_pool()
+        if pool and cls._loop:
+            cls._loop.run_until_complete(pool.wait_closed())
         if cls._loop:
             cls._loop.close()
             cls._loop = None
     
+    @classmethod
+    async def disconnect_async(cls) -> None:
+        """Disconnect a pool opened with connect_async."""
+        pool = cls._detach_pool()
+        if pool:
+            await pool.wait_closed()
+    
+    @classmethod
+    def _detach_pool(cls) -> Optional[Pool]:
+        """Stop the batch writer, clear pool_ready() and start closing the pool.
+        
+        Batched inserts still waiting in the queue fail with RuntimeError.
+        """
+        if cls._writer_task is not None:
+            cls._writer_task.cancel()
+            cls._writer_task = None
+        if cls._write_queue is not None:
+            queue, cls._write_queue = cls._write_queue, None
+            pending = []
+            while not queue.empty():
+                pending.append(queue.get_nowait()[2])
+            cls._fail_writes(pending, "Database disconnected before the batched insert ran")
+        cls.pool_ready().clear()
+        pool, cls._pool = cls._pool, None
+        if pool:
+            pool.close()
+        return pool
+    
+    @staticmethod
+    def _new_loop() -> asyncio.AbstractEventLoop:
+        """Create the loop used by the sync API, preferring uvloop when installed."""
+        return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    
     @classmethod
     def _run_sync(cls, coro):
         """Run coroutine synchronously."""
         if cls._loop is None or cls._loop.is_closed():
-            cls._loop = asyncio.new_event_loop()
+            cls._loop = cls._new_loop()
             asyncio.set_event_loop(cls._loop)
         return cls._loop.run_until_complete(coro)
 
     @classmethod
-    def insert(cls, table: str, data: dict) -> Union[str, int]:
-        """Insert a record."""
-        return cls._run_sync(cls.insert_async(table, data))
+    def insert(cls, table: str, data: Union[dict, List[dict]], batched: bool = False) -> Union[str, int]:
+        """Insert a record, or a list of records via insert_many."""
+        return cls._run_sync(cls.insert_async(table, data, batched))
             
     @classmethod
-    def find(cls, table: str, filter: dict = {}, columns: list = ['*']) -> List[Dict[str, Any]]:
+    def insert_many(cls, table: str, data: List[dict]) -> int:
+        """Insert multiple records."""
+        return cls._run_sync(cls.insert_many_async(table, data))
+            
+    @classmethod
+    def find(cls, table: str, filter: Optional[dict] = None, columns: Optional[list] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Find records matching filter."""
-        return cls._run_sync(cls.find_async(table, filter, columns))
+        return cls._run_sync(cls.find_async(table, filter, columns, limit))
             
     @classmethod
-    def find_one(cls, table: str, filter: dict = {}, columns: list = ['*']) -> Optional[Dict[str, Any]]:
+    def find_one(cls, table: str, filter: Optional[dict] = None, columns: Optional[list] = None) -> Optional[Dict[str, Any]]:
         """Find one record matching filter."""
         return cls._run_sync(cls.find_one_async(table, filter, columns))
             
@@ -83,119 +209,577 @@ class MysqlDB(ORM):
     def update(cls, table: str, filter: dict, data: dict) -> int:
         """Update records matching filter."""
         return cls._run_sync(cls.update_async(table, filter, data))
-            
+
     @classmethod
     def remove(cls, table: str, filter: dict) -> int:
         """Remove records matching filter."""
         return cls._run_sync(cls.remove_async(table, filter))
 
     @classmethod
-    def sum(cls, table: str, column: str, filter: dict = {}) -> Union[int, float]:
+    def count(cls, table: str, filter: Optional[dict] = None, approximate: bool = False) -> int:
+        """Count records matching filter."""
+        return cls._run_sync(cls.count_async(table, filter, approximate))
+
+    @classmethod
+    def exists(cls, table: str, filter: Optional[dict] = None) -> bool:
+        """Check whether any record matches filter."""
+        return cls._run_sync(cls.exists_async(table, filter))
+
+    @classmethod
+    def sum(cls, table: str, column: str, filter: Optional[dict] = None) -> Union[int, float]:
         """Sum values in a column."""
         return cls._run_sync(cls.sum_async(table, column, filter))
 
     @classmethod
-    async def insert_async(cls, table: str, data: dict) -> Union[str, int]:
-        """Insert a record asynchronously."""
+    def execute_pipeline(cls, statements: List[Tuple[str, tuple]]) -> List[Any]:
+        """Run several statements in a single round trip."""
+        return cls._run_sync(cls.execute_pipeline_async(statements))
+
+    @classmethod
+    def import_from_file(cls, table: str, path: str, fmt: str = 'csv') -> int:
+        """Bulk load a file into a table."""
+        return cls._run_sync(cls.import_from_file_async(table, path, fmt))
+
+    @classmethod
+    async def insert_async(cls, table: str, data: Union[dict, List[dict]], batched: bool = False, conn: Optional[Connection] = None, returning: bool = False) -> Union[str, int, Optional[Dict[str, Any]]]:
+        """Insert a record asynchronously.
+        
+        With batched=True the row is queued and written together with other
+        rows of the same table and columns in one multi-row INSERT. A list of
+        records is handed to insert_many_async and the row count is returned.
+        Batching is skipped when an explicit or pinned conn is in use.
+        
+        With returning=True the stored row is read back by LAST_INSERT_ID()
+        on the same connection and returned as a dict instead of the id.
+        """
         if cls._pool is None:
             raise RuntimeError("Database not connected")
+        
+        if isinstance(data, list):
+            return await cls.insert_many_async(table, data, conn=conn)
+        
+        if batched and conn is None and _current_conn.get() is None and not returning:
+            loop = asyncio.get_running_loop()
+            if cls._writer_task is None or cls._writer_task.done() or cls._writer_task.get_loop() is not loop:
+                cls._write_queue = asyncio.Queue()
+                cls._writer_task = loop.create_task(cls._batch_writer(cls._write_queue))
+            future = loop.create_future()
+            cls._write_queue.put_nowait((table, data, future))  # type: ignore
+            return await future
+
+        columns = tuple(sorted(data))
+        query = cached_sql(('mysql_insert', table, columns), lambda: (
+            f'INSERT INTO {table}({", ".join(columns)}) '
+            f'VALUES({", ".join(["%s"] * len(columns))})'
+        ))
 
-        query = f'INSERT INTO {table}('
-        query += ', '.join(data.keys())
-        query += ") VALUES(%s" + ", %s" * (len(data) - 1) + ")"
+        params = tuple(data[k] for k in columns)
+        if returning:
+            return await cls._insert_returning(table, query, params, conn)
 
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor(DictCursor) as cur:
-                await cur.execute(query, tuple(data.values()))
+        async with cls._connection(conn) as conn:
+            async with conn.cursor() as cur:
+                await cls._execute(conn, cur, query, params)
                 return cur.lastrowid or 0
 
     @classmethod
-    async def find_async(cls, table: str, filter: dict = {}, columns: list = ['*']) -> List[Dict[str, Any]]:
+    async def _insert_returning(cls, table: str, query: str, params: tuple, conn: Optional[Connection] = None) -> Optional[Dict[str, Any]]:
+        """Run an INSERT and select the new row by LAST_INSERT_ID(), which is per connection."""
+        select = cached_sql(('mysql_select_inserted', table), lambda: (
+            f'SELECT * FROM {table} WHERE id = LAST_INSERT_ID()'
+        ))
+        return await cls._write_returning(query, params, select, (), conn)
+
+    @classmethod
+    async def _write_returning(cls, query: str, params: tuple, select: str, select_params: tuple, conn: Optional[Connection] = None) -> Optional[Dict[str, Any]]:
+        """Run a write and then a single-row SELECT on the same connection.
+        
+        With multi_statements enabled both are sent in a single round trip.
+        """
+        async with cls._connection(conn) as conn:
+            async with conn.cursor() as cur:
+                if cls._multi_statements:
+                    await cur.execute(cur.mogrify(query, params) + '; ' + cur.mogrify(select, select_params))
+                    await cur.nextset()
+                else:
+                    await cls._execute(conn, cur, query, params)
+                    await cls._execute(conn, cur, select, select_params)
+                row = await cur.fetchone()
+                if row is None:
+                    return None
+                return dict(zip(cls._column_names(cur), row))
+
+    @classmethod
+    async def insert_many_async(cls, table: str, data: List[dict], conn: Optional[Connection] = None) -> int:
+        """Insert multiple records asynchronously with multi-row INSERTs."""
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+        if not data:
+            return 0
+
+        columns = tuple(sorted(data[0]))
+        total = 0
+        async with cls._connection(conn) as conn:
+            async with conn.cursor() as cur:
+                for start in range(0, len(data), cls.insert_chunk_size):
+                    query, params = multi_row_insert(table, columns, data[start:start + cls.insert_chunk_size])
+                    await cur.execute(query, params)
+                    total += cur.rowcount
+        return total
+
+    @classmethod
+    async def _batch_writer(cls, queue: asyncio.Queue) -> None:
+        """Drain queued inserts and flush them grouped by table and columns.
+        
+        When cancelled, the inserts already taken from the queue fail with RuntimeError.
+        """
+        loop = asyncio.get_running_loop()
+        items: list = []
+        try:
+            while True:
+                items = [await queue.get()]
+                deadline = loop.time() + cls.batch_max_wait
+                while len(items) < cls.batch_max_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                
+                groups: Dict[tuple, list] = {}
+                for table, data, future in items:
+                    groups.setdefault((table, tuple(sorted(data))), []).append((data, future))
+                
+                for (table, columns), rows in groups.items():
+                    await cls._flush_batch(table, columns, rows)
+        except asyncio.CancelledError:
+            cls._fail_writes([future for _, _, future in items], "Batch writer stopped before the insert completed")
+            raise
+    
+    @staticmethod
+    def _fail_writes(futures: List[asyncio.Future], message: str) -> None:
+        """Fail every batched insert future that is still pending."""
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError(message))
+    
+    @classmethod
+    async def _flush_batch(cls, table: str, columns: tuple, rows: list) -> None:
+        """Write one group of queued rows with a single multi-row INSERT."""
+        query, params = multi_row_insert(table, columns, [data for data, _ in rows])
+        
+        try:
+            async with cls._pool.acquire() as conn:  # type: ignore
+                async with conn.cursor() as cur:
+                    await cur.execute(query, params)
+                    first_id = cur.lastrowid or 0
+        except Exception as e:
+            for _, future in rows:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        # MySQL reports the id of the first row; the rest follow consecutively
+        for i, (_, future) in enumerate(rows):
+            if not future.done():
+                future.set_result(first_id + i if first_id else 0)
+
+    @classmethod
+    @asynccontextmanager
+    async def pinned(cls, conn: Optional[Connection] = None) -> AsyncIterator[Connection]:
+        """Run every *_async call made in this context on one connection.
+        
+        A pooled connection is acquired, and released on exit, unless conn is
+        given. Tasks started inside the block inherit the pin, so don't gather
+        queries under it: one connection runs one statement at a time.
+        """
+        async with cls._connection(conn) as conn:
+            token = _current_conn.set(conn)
+            try:
+                yield conn
+            finally:
+                _current_conn.reset(token)
+
+    @classmethod
+    @asynccontextmanager
+    async def _connection(cls, conn: Optional[Connection] = None) -> AsyncIterator[Connection]:
+        """Yield conn, else the connection pinned by pinned(), else a pooled connection."""
+        if conn is None:
+            conn = _current_conn.get()
+        if conn is not None:
+            yield conn
+            return
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+        async with cls._pool.acquire() as pooled:
+            yield pooled
+
+    @classmethod
+    async def _execute(cls, conn: Connection, cur: Any, query: str, params: tuple) -> None:
+        """Execute a statement, via a per-connection prepared statement if enabled.
+        
+        Prepared statements live on the server connection, so the names already
+        prepared on a connection are tracked on the connection object itself.
+        """
+        if not cls.server_prepared or not params:
+            await cur.execute(query, params)
+            return
+        
+        name = cls._prepared.get(query)
+        if name is None:
+            name = cls._prepared[query] = f'odbms_stmt_{len(cls._prepared)}'
+        
+        prepared = getattr(conn, '_odbms_prepared', None)
+        if prepared is None:
+            prepared = set()
+            setattr(conn, '_odbms_prepared', prepared)
+        if name not in prepared:
+            await cur.execute(f'PREPARE {name} FROM %s', (query.replace('%s', '?'),))
+            prepared.add(name)
+        
+        variables = [f'@odbms_p{i}' for i in range(len(params))]
+        await cur.execute('SET ' + ', '.join(f'{var} = %s' for var in variables), params)
+        await cur.execute(f'EXECUTE {name} USING {", ".join(variables)}')
+
+    @classmethod
+    async def _resolve_columns(cls, conn: Connection, table: str, columns: Optional[list]) -> list:
+        """Expand ['*'] (the default) to the table's cached column list when enabled."""
+        columns = columns or ['*']
+        if not cls.expand_select_star or list(columns) != ['*']:
+            return columns
+        
+        cached = cls._columns_cache.get(table)
+        if cached is None:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT column_name FROM information_schema.columns "
+                    "WHERE table_schema = DATABASE() AND table_name = %s "
+                    "ORDER BY ordinal_position",
+                    (table,)
+                )
+                cached = cls._columns_cache[table] = [row[0] for row in await cur.fetchall()]
+        return cached or columns
+
+    @staticmethod
+    def _filter_shape(filter: Optional[dict]) -> Tuple[tuple, tuple]:
+        """Split filter into a hashable WHERE shape and its parameters.
+        
+        Plain values match with '='. {'$op': value} uses the operator from
+        _FILTER_OPERATORS, and $in/$nin lists become IN (...)/NOT IN (...), so
+        matching runs on the server. The placeholder count is rounded up to a
+        power of two, padded by repeating the last item (duplicates change
+        neither IN nor NOT IN; NULL padding would break NOT IN), so varying list
+        lengths share a logarithmic number of cached statements.
+        """
+        if not filter:
+            return (), ()
+        shape: list = []
+        params: list = []
+        for key in sorted(filter):
+            value = filter[key]
+            if not isinstance(value, dict):
+                shape.append((key,))
+                params.append(value)
+                continue
+            for op in sorted(value):
+                operand = value[op]
+                if op in ('$in', '$nin'):
+                    items = list(operand)
+                    size = 1 << (len(items) - 1).bit_length() if items else 0
+                    shape.append((key, op, size))
+                    params.extend(items)
+                    params.extend(items[-1:] * (size - len(items)))
+                elif op in _FILTER_OPERATORS:
+                    shape.append((key, op))
+                    params.append(operand)
+                else:
+                    raise ValueError(f"Unsupported query operator: {op}")
+        return tuple(shape), tuple(params)
+
+    @staticmethod
+    def _where_sql(shape: tuple) -> str:
+        """Build the parameterized WHERE clause for a shape from _filter_shape."""
+        if not shape:
+            return ''
+        conditions = []
+        for key, *op in shape:
+            if not op:
+                conditions.append(f'{key} = %s')
+            elif op[0] in ('$in', '$nin'):
+                negate = op[0] == '$nin'
+                if op[1] == 0:
+                    # IN () is a syntax error; an empty list matches nothing (or everything)
+                    conditions.append('1 = 1' if negate else '1 = 0')
+                else:
+                    placeholders = ', '.join(['%s'] * op[1])
+                    conditions.append(f'{key} {"NOT IN" if negate else "IN"} ({placeholders})')
+            else:
+                conditions.append(f'{key} {_FILTER_OPERATORS[op[0]]} %s')
+        return ' WHERE ' + ' AND '.join(conditions)
+
+    @staticmethod
+    def _column_names(cur: Any) -> Tuple[str, ...]:
+        """Return the result column names of the cursor's last query."""
+        return tuple(desc[0] for desc in cur.description)
+
+    @classmethod
+    async def find_async(cls, table: str, filter: Optional[dict] = None, columns: Optional[list] = None, limit: Optional[int] = None, conn: Optional[Connection] = None) -> List[Dict[str, Any]]:
         """Find records matching filter asynchronously."""
+        results: List[Dict[str, Any]] = []
+        async for row in cls.find_iter_async(table, filter, columns, limit, conn=conn):
+            results.append(row)
+        return results
+
+    @classmethod
+    async def find_iter_async(cls, table: str, filter: Optional[dict] = None, columns: Optional[list] = None, limit: Optional[int] = None, conn: Optional[Connection] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream records matching filter through an unbuffered server-side cursor.
+        
+        The connection stays busy until the stream is exhausted or closed, so a
+        consumer that stops early must close the generator (``await rows.aclose()``
+        or ``contextlib.aclosing``); the unread rows are drained then. Otherwise
+        cleanup waits for garbage collection, and an explicit or pinned() conn
+        fails its next query with "Commands out of sync".
+        """
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        query = f'SELECT {", ".join(columns)} FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f'{k} = %s' for k in filter.keys()])
-            query += f' WHERE {conditions}'
+        shape, params = cls._filter_shape(filter)
+        params += (limit,) if limit is not None else ()
 
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor(DictCursor) as cur:
-                await cur.execute(query, tuple(filter.values()))
-                results = await cur.fetchall()
-                return [dict(row) for row in results]
+        async with cls._connection(conn) as conn:
+            columns = await cls._resolve_columns(conn, table, columns)
+            query = cached_sql(('mysql_find', table, shape, tuple(columns), limit is not None), lambda: (
+                f'SELECT {", ".join(columns)} FROM {table}' + cls._where_sql(shape)
+                + (' LIMIT %s' if limit is not None else '')
+            ))
+            cur = await conn.cursor(SSCursor)
+            try:
+                await cls._execute(conn, cur, query, params)
+                names = cls._column_names(cur)
+                while True:
+                    rows = await cur.fetchmany(cls.fetch_chunk_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(zip(names, row))
+            finally:
+                try:
+                    # Read off any rows the consumer left so the connection is usable again
+                    await cur.close()
+                except BaseException:
+                    # The drain itself failed or was cancelled: the protocol state is
+                    # unknown, so drop the connection rather than reuse it
+                    conn.close()
+                    raise
 
     @classmethod
-    async def find_one_async(cls, table: str, filter: dict = {}, columns: list = ['*']) -> Optional[Dict[str, Any]]:
+    async def find_one_async(cls, table: str, filter: Optional[dict] = None, columns: Optional[list] = None, conn: Optional[Connection] = None) -> Optional[Dict[str, Any]]:
         """Find one record matching filter asynchronously."""
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        query = f'SELECT {", ".join(columns)} FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f'{k} = %s' for k in filter.keys()])
-            query += f' WHERE {conditions}'
-        query += ' LIMIT 1'
-
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor(DictCursor) as cur:
-                await cur.execute(query, tuple(filter.values()))
+        shape, params = cls._filter_shape(filter)
+        async with cls._connection(conn) as conn:
+            columns = await cls._resolve_columns(conn, table, columns)
+            query = cached_sql(('mysql_find_one', table, shape, tuple(columns)), lambda: (
+                f'SELECT {", ".join(columns)} FROM {table}' + cls._where_sql(shape) + ' LIMIT 1'
+            ))
+            async with conn.cursor() as cur:
+                await cls._execute(conn, cur, query, params)
                 result = await cur.fetchone()
-                return dict(result) if result else None
+                if result is None:
+                    return None
+                return dict(zip(cls._column_names(cur), result))
 
     @classmethod
-    async def update_async(cls, table: str, filter: dict, data: dict) -> int:
+    async def update_async(cls, table: str, filter: dict, data: dict, conn: Optional[Connection] = None) -> int:
         """Update records matching filter asynchronously."""
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        set_clause = ', '.join([f"{k} = %s" for k in data.keys()])
-        query = f'UPDATE {table} SET {set_clause}'
-        
-        params = list(data.values())
-        if filter:
-            conditions = ' AND '.join([f"{k} = %s" for k in filter.keys()])
-            query += f' WHERE {conditions}'
-            params.extend(filter.values())
+        columns = tuple(sorted(data))
+        shape, where_params = cls._filter_shape(filter)
+        query = cached_sql(('mysql_update', table, columns, shape), lambda: (
+            f'UPDATE {table} SET {", ".join([f"{k} = %s" for k in columns])}' + cls._where_sql(shape)
+        ))
+        params = tuple(data[k] for k in columns) + where_params
 
-        async with cls._pool.acquire() as conn:
+        async with cls._connection(conn) as conn:
             async with conn.cursor() as cur:
-                await cur.execute(query, tuple(params))
+                await cls._execute(conn, cur, query, params)
                 return cur.rowcount
 
     @classmethod
-    async def remove_async(cls, table: str, filter: dict) -> int:
+    async def remove_async(cls, table: str, filter: dict, conn: Optional[Connection] = None) -> int:
         """Remove records matching filter asynchronously."""
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        query = f'DELETE FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f"{k} = %s" for k in filter.keys()])
-            query += f' WHERE {conditions}'
+        shape, params = cls._filter_shape(filter)
+        query = cached_sql(('mysql_remove', table, shape), lambda: (
+            f'DELETE FROM {table}' + cls._where_sql(shape)
+        ))
 
-        async with cls._pool.acquire() as conn:
+        async with cls._connection(conn) as conn:
             async with conn.cursor() as cur:
-                await cur.execute(query, tuple(filter.values()))
+                await cls._execute(conn, cur, query, params)
                 return cur.rowcount
 
     @classmethod
-    async def sum_async(cls, table: str, column: str, filter: dict = {}) -> Union[int, float]:
+    async def exists_async(cls, table: str, filter: Optional[dict] = None, conn: Optional[Connection] = None) -> bool:
+        """Check whether any record matches filter; the server stops at the first match."""
+        shape, params = cls._filter_shape(filter)
+        query = cached_sql(('mysql_exists', table, shape), lambda: (
+            f'SELECT 1 FROM {table}' + cls._where_sql(shape) + ' LIMIT 1'
+        ))
+
+        async with cls._connection(conn) as conn:
+            async with conn.cursor() as cur:
+                await cls._execute(conn, cur, query, params)
+                return await cur.fetchone() is not None
+
+    @classmethod
+    async def count_async(cls, table: str, filter: Optional[dict] = None, approximate: bool = False, conn: Optional[Connection] = None) -> int:
+        """Count records matching filter asynchronously.
+        
+        With approximate=True and no filter, InnoDB's table_rows estimate from
+        information_schema is used instead of a full scan and cached for
+        approximate_count_ttl seconds.
+        """
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+
+        if approximate and not filter:
+            cached = cls._approx_count_get(table)
+            if cached is not None:
+                return cached
+            query = ("SELECT table_rows FROM information_schema.tables "
+                     "WHERE table_schema = DATABASE() AND table_name = %s")
+            params: tuple = (table,)
+        else:
+            shape, params = cls._filter_shape(filter)
+            query = cached_sql(('mysql_count', table, shape), lambda: (
+                f'SELECT COUNT(*) FROM {table}' + cls._where_sql(shape)
+            ))
+
+        async with cls._connection(conn) as conn:
+            async with conn.cursor() as cur:
+                await cls._execute(conn, cur, query, params)
+                result = await cur.fetchone()
+        
+        total = int(result[0] or 0) if result else 0
+        if approximate and not filter:
+            return cls._approx_count_set(table, total)
+        return total
+
+    @classmethod
+    async def sum_async(cls, table: str, column: str, filter: Optional[dict] = None, conn: Optional[Connection] = None) -> Union[int, float]:
         """Sum values in a column asynchronously."""
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        query = f'SELECT SUM({column}) as total FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f'{k} = %s' for k in filter.keys()])
-            query += f' WHERE {conditions}'
+        shape, params = cls._filter_shape(filter)
+        query = cached_sql(('mysql_sum', table, column, shape), lambda: (
+            f'SELECT COALESCE(SUM({column}), 0) FROM {table}' + cls._where_sql(shape)
+        ))
 
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor(DictCursor) as cur:
-                await cur.execute(query, tuple(filter.values()))
+        # The aggregate runs on the server; only the single total comes back
+        async with cls._connection(conn) as conn:
+            async with conn.cursor() as cur:
+                await cls._execute(conn, cur, query, params)
                 result = await cur.fetchone()
-                if result:
-                    total = result['total']
-                    return float(total) if total is not None else 0
-                return 0
\ No newline at end of file
+        return float(result[0]) if result else 0
+
+    @classmethod
+    async def import_from_file_async(cls, table: str, path: str, fmt: str = 'csv') -> int:
+        """Bulk load a CSV file (with a header line) using LOAD DATA LOCAL INFILE."""
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+        if fmt != 'csv':
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+        with open(path, newline='') as file:
+            header = [cell.strip() for cell in next(csv.reader(file), [])]
+        if not header:
+            raise ValueError(f"{path} has no header line naming the columns")
+        # The header and table name are spliced into the SQL text
+        check_identifiers(table, *header)
+
+        query = (
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+            "FIELDS TERMINATED BY ',' ENCLOSED BY '\"' "
+            "LINES TERMINATED BY '\\n' IGNORE 1 LINES"
+            f" ({', '.join(header)})"
+        )
+
+        # LOAD DATA LOCAL must be enabled per connection, so use a dedicated one
+        conn = await aiomysql.connect(local_infile=True, **cls._conn_settings)
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(query, (os.path.abspath(path),))
+                return cur.rowcount
+        finally:
+            conn.close()
+
+    @classmethod
+    @asynccontextmanager
+    async def pipeline(cls) -> AsyncIterator[List[Tuple[str, tuple]]]:
+        """Buffer (sql, params) statements and send them together on exit.
+        
+        Usage:
+            async with MysqlDB.pipeline() as statements:
+                statements.append(('UPDATE users SET age = %s WHERE id = %s', (31, 1)))
+                statements.append(('DELETE FROM sessions WHERE user_id = %s', (1,)))
+        
+        Use execute_pipeline_async directly when the results are needed.
+        """
+        statements: List[Tuple[str, tuple]] = []
+        yield statements
+        if statements:
+            await cls.execute_pipeline_async(statements)
+
+    @staticmethod
+    async def _exec_all(cur: Any, statements: List[Tuple[str, tuple]]) -> List[Any]:
+        """Run statements in order on one cursor, with results shaped as in execute_pipeline_async."""
+        results: List[Any] = []
+        for sql, params in statements:
+            await cur.execute(sql, params)
+            if cur.description:
+                names = tuple(desc[0] for desc in cur.description)
+                results.append([dict(zip(names, row)) for row in await cur.fetchall()])
+            else:
+                results.append(cur.rowcount)
+        return results
+
+    @classmethod
+    async def execute_pipeline_async(cls, statements: List[Tuple[str, tuple]]) -> List[Any]:
+        """Run several statements in a single round trip.
+        
+        Returns one entry per statement: a list of row dicts for statements that
+        produce a result set, otherwise the affected row count. The single round
+        trip needs the pool to be created with dbsettings['multi_statements'] =
+        True; without it the statements run one by one on a shared cursor.
+        """
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+        if not statements:
+            return []
+
+        results: List[Any] = []
+        async with cls._connection() as conn:
+            async with conn.cursor() as cur:
+                if not cls._multi_statements:
+                    return await cls._exec_all(cur, statements)
+                query = '; '.join(cur.mogrify(sql, params) for sql, params in statements)
+                await cur.execute(query)
+                while True:
+                    if cur.description:
+                        names = tuple(desc[0] for desc in cur.description)
+                        results.append([dict(zip(names, row)) for row in await cur.fetchall()])
+                    else:
+                        results.append(cur.rowcount)
+                    if not await cur.nextset():
+                        break
+        return results
@@ -1,67 +1,356 @@
-import logging
-import os
+import io
+import re
+import threading
+from itertools import count
 from sys import exit
-from typing import Dict, List, Any, Optional, Union, Type, cast
+from typing import Dict, List, Any, Optional, Union, Tuple, AsyncIterator, Iterator, Callable, TypeVar, Awaitable
 import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 import aiopg
-from aiopg import Pool, Connection, Cursor
+import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from aiopg import Pool, Connection
 
-from .base import ORM
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
 
-class PostgresqlDB(ORM):
-    _db: Optional[Connection] = None
+from .base import ORM, cached_sql, check_identifiers, checked_sql, multi_row_insert, row_tuples
+
+# Connection of the transaction() block the current task is running in, if any
+_tx_conn: ContextVar[Optional[Connection]] = ContextVar('odbms_pg_tx_conn', default=None)
+
+_PoolT = TypeVar('_PoolT')
+
+# Suffixes for find_iter_async cursor names, unique so streams can share a transaction
+_stream_ids = count()
+
+def _csv_quote(value: Any) -> str:
+    """Format a value as a quoted CSV field."""
+    return '"' + str(value).replace('"', '""') + '"'
+
+class _PostgresqlSQL:
+    """Connection settings and SQL builders shared by PostgresqlDB and PostgresqlDBSync.
+    
+    Mixed in ahead of ORM, which provides _where_clause and the result cache.
+    """
     _dbms: str = 'postgresql'
+    
+    # insert_many batches at least this large are streamed with COPY
+    copy_threshold: int = 500
+    _dsn: str = ''
+    _conn_settings: Dict[str, Any] = {}
+
+    @classmethod
+    def _open_pool(cls, dbsettings: dict, create: Callable[[str], _PoolT]) -> _PoolT:
+        """Save the connection settings and return create(dsn).
+        
+        If the database does not exist yet, retries without it so it can be created.
+        """
+        cls._save_settings(dbsettings)
+        try:
+            return create(cls._dsn)
+        except Exception as e:
+            return create(cls._dsn_without_database(e))
+    
+    @classmethod
+    async def _open_pool_async(cls, dbsettings: dict, create: Callable[[str], Awaitable[_PoolT]]) -> _PoolT:
+        """Like _open_pool, for a create(dsn) that must be awaited."""
+        cls._save_settings(dbsettings)
+        try:
+            return await create(cls._dsn)
+        except Exception as e:
+            return await create(cls._dsn_without_database(e))
+    
+    @classmethod
+    def _save_settings(cls, dbsettings: dict) -> None:
+        """Keep the connection settings and the DSN built from them."""
+        cls._conn_settings = {
+            'database': dbsettings.get('database'),
+            'user': dbsettings['user'],
+            'password': dbsettings['password'],
+            'host': dbsettings.get('host', 'localhost'),
+            'port': dbsettings.get('port', 5432)
+        }
+        cls._dsn = cls._build_dsn()
+    
+    @classmethod
+    def _dsn_without_database(cls, error: Exception) -> str:
+        """Return the DSN to retry with when the database is missing; exit on other errors."""
+        if 'database' in str(error):
+            # Try connecting without database to create it
+            del cls._conn_settings['database']
+            cls._dsn = cls._build_dsn()
+            return cls._dsn
+        print(str(error))
+        exit(1)
+    
+    @classmethod
+    def _build_dsn(cls) -> str:
+        """Build a libpq DSN from the saved connection settings."""
+        settings = cls._conn_settings
+        dsn = (
+            f"user={settings['user']} "
+            f"password={settings['password']} "
+            f"host={settings['host']} "
+            f"port={settings['port']}"
+        )
+        if 'database' in settings:
+            dsn = f"dbname={settings['database']} " + dsn
+        return dsn
+    
+    @classmethod
+    def _insert_sql(cls, table: str, columns: tuple) -> str:
+        """Single-row INSERT returning the new id."""
+        return checked_sql(('pg_insert', table, columns), lambda: (
+            f'INSERT INTO {table} ({", ".join(columns)}) '
+            f'VALUES ({", ".join(["%s"] * len(columns))}) RETURNING id'
+        ))
+
+    @classmethod
+    def _select_sql(cls, table: str, keys: tuple, columns: list, limit_one: bool = False) -> str:
+        """SELECT of columns filtered on equality of keys."""
+        return checked_sql(('pg_find', table, keys, tuple(columns), limit_one), lambda: (
+            f'SELECT {", ".join(columns)} FROM {table}' + cls._where_clause(keys)
+            + (' LIMIT 1' if limit_one else '')
+        ))
+
+    @classmethod
+    def _update_sql(cls, table: str, columns: tuple, keys: tuple) -> str:
+        """UPDATE setting columns on rows matching keys."""
+        return checked_sql(('pg_update', table, columns, keys), lambda: (
+            f'UPDATE {table} SET {", ".join([f"{k} = %s" for k in columns])}' + cls._where_clause(keys)
+        ))
+
+    @classmethod
+    def _delete_sql(cls, table: str, keys: tuple) -> str:
+        """DELETE of rows matching keys."""
+        return checked_sql(('pg_remove', table, keys), lambda: (
+            f'DELETE FROM {table}' + cls._where_clause(keys)
+        ))
+
+    @classmethod
+    def _count_sql(cls, table: str, keys: tuple) -> str:
+        """Exact COUNT(*) of rows matching keys."""
+        return checked_sql(('pg_count', table, keys), lambda: (
+            f'SELECT COUNT(*) FROM {table}' + cls._where_clause(keys)
+        ))
+
+    @classmethod
+    def _sum_sql(cls, table: str, column: str, keys: tuple) -> str:
+        """SUM of a column over rows matching keys."""
+        return checked_sql(('pg_sum', table, column, keys), lambda: (
+            f'SELECT SUM({column}) as total FROM {table}' + cls._where_clause(keys)
+        ))
+
+    @staticmethod
+    def _copy_csv(cur: Any, table: str, columns: tuple, data: List[dict]) -> int:
+        """Write rows to an in-memory CSV and COPY it in on a psycopg2 cursor.
+        
+        Every value is quoted and NULL is written as an unquoted empty field,
+        which is the only form CSV COPY reads as NULL; a quoted string such as
+        "\\N" or "" is always loaded as text.
+        """
+        buf = io.StringIO()
+        buf.writelines(
+            ','.join(['' if row[column] is None else _csv_quote(row[column]) for column in columns]) + '\n'
+            for row in data
+        )
+        buf.seek(0)
+        cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV)", buf)
+        return cur.rowcount
+
+class PostgresqlDB(_PostgresqlSQL, ORM):
+    _db: Optional[Connection] = None
     _pool: Optional[Pool] = None
+    # Loop the pool was created on; its connections only work there
+    _pool_loop: Optional[asyncio.AbstractEventLoop] = None
     _loop: Optional[asyncio.AbstractEventLoop] = None
+    _loop_thread: Optional[threading.Thread] = None
+    
+    # Opt-in: run parameterized statements through per-connection PREPARE/EXECUTE.
+    # Each new statement shape costs an extra round trip, a prepared SELECT *
+    # fails after the table's columns change, and prepared statements do not
+    # survive pgbouncer transaction pooling.
+    server_prepared: bool = False
+    _prepared: Dict[str, Tuple[str, str]] = {}
+    
+    # Rows pulled per FETCH when streaming with find_iter_async
+    fetch_chunk_size: int = 1000
 
     @classmethod
     def connect(cls, dbsettings: dict) -> None:
         '''Connection method'''
-        cls._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(cls._loop)
+        loop = cls._start_loop()
+        cls._prepared.clear()
         
-        try:
-            dsn = (
-                f"dbname={dbsettings.get('database')} "
-                f"user={dbsettings['user']} "
-                f"password={dbsettings['password']} "
-                f"host={dbsettings.get('host', 'localhost')} "
-                f"port={dbsettings.get('port', 5432)}"
-            )
-            cls._pool = cls._loop.run_until_complete(aiopg.create_pool(dsn))
-        except Exception as e:
-            if 'database' in str(e):
-                # Try connecting without database to create it
-                dbsettings = dbsettings.copy()
-                dsn = (
-                    f"user={dbsettings['user']} "
-                    f"password={dbsettings['password']} "
-                    f"host={dbsettings.get('host', 'localhost')} "
-                    f"port={dbsettings.get('port', 5432)}"
-                )
-                cls._pool = cls._loop.run_until_complete(aiopg.create_pool(dsn))
-            else:
-                print(str(e))
-                exit(1)
+        pool_settings = cls._pool_settings(dbsettings)
+        cls._pool = cls._open_pool(
+            dbsettings, lambda dsn: cls._run_sync(aiopg.create_pool(dsn, **pool_settings))
+        )
+        cls._pool_loop = loop
+    
+    @classmethod
+    async def connect_async(cls, dbsettings: dict) -> None:
+        """Create the pool on the running event loop.
+        
+        Use the *_async API afterwards: the sync wrappers run on the background
+        loop, which cannot drive a pool bound to this one.
+        """
+        cls._prepared.clear()
+        
+        pool_settings = cls._pool_settings(dbsettings)
+        cls._pool = await cls._open_pool_async(
+            dbsettings, lambda dsn: aiopg.create_pool(dsn, **pool_settings)
+        )
+        cls._pool_loop = asyncio.get_running_loop()
+    
+    @staticmethod
+    def _pool_settings(dbsettings: dict) -> Dict[str, Any]:
+        """aiopg pool sizing and recycling options from dbsettings."""
+        return {
+            'minsize': dbsettings.get('pool_min', 10),
+            'maxsize': dbsettings.get('pool_max', 32),
+            'timeout': dbsettings.get('pool_timeout', 60.0),
+            'pool_recycle': dbsettings.get('pool_recycle', 3600)
+        }
     
     @classmethod
     def disconnect(cls) -> None:
         """Disconnect from PostgreSQL."""
         if cls._pool:
             cls._pool.close()
-            if cls._loop:
-                cls._loop.run_until_complete(cls._pool.wait_closed())
+            if cls._loop and cls._pool_loop is cls._loop:
+                cls._run_sync(cls._pool.wait_closed())
+            cls._pool = None
+            cls._pool_loop = None
         if cls._loop:
+            cls._loop.call_soon_threadsafe(cls._loop.stop)
+            if cls._loop_thread is not None:
+                cls._loop_thread.join()
             cls._loop.close()
             cls._loop = None
+            cls._loop_thread = None
     
     @classmethod
-    def _run_sync(cls, coro):
-        """Run coroutine synchronously."""
+    async def disconnect_async(cls) -> None:
+        """Disconnect a pool opened with connect_async."""
+        pool, cls._pool = cls._pool, None
+        cls._pool_loop = None
+        if pool:
+            pool.close()
+            await pool.wait_closed()
+    
+    @classmethod
+    def _start_loop(cls) -> asyncio.AbstractEventLoop:
+        """Start the event loop backing the sync API on a daemon thread."""
         if cls._loop is None or cls._loop.is_closed():
-            cls._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(cls._loop)
-        return cls._loop.run_until_complete(coro)
+            loop = asyncio.new_event_loop()
+            cls._loop_thread = threading.Thread(target=loop.run_forever, name='odbms-postgresql', daemon=True)
+            cls._loop_thread.start()
+            cls._loop = loop
+        return cls._loop
+    
+    @classmethod
+    def _run_sync(cls, coro):
+        """Run coroutine synchronously on the background loop.
+        
+        Raises RuntimeError on the background loop's own thread (e.g. from a
+        hook run there), where waiting for the result would deadlock.
+        """
+        if cls._loop_thread is not None and threading.get_ident() == cls._loop_thread.ident:
+            coro.close()
+            raise RuntimeError(
+                "PostgresqlDB sync methods cannot be called from its event loop thread; await the *_async methods"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, cls._start_loop()).result()
+    
+    @classmethod
+    def _checked_pool(cls) -> Pool:
+        """Return the pool, raising RuntimeError unless it belongs to the running loop."""
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+        if asyncio.get_running_loop() is not cls._pool_loop:
+            raise RuntimeError(
+                "The PostgresqlDB pool belongs to another event loop; "
+                "use connect_async() on this loop, or the sync API after connect()"
+            )
+        return cls._pool
+
+    @classmethod
+    @asynccontextmanager
+    async def _connection(cls) -> AsyncIterator[Connection]:
+        """Yield the current transaction's connection, or one from the pool."""
+        conn = _tx_conn.get()
+        if conn is not None:
+            yield conn
+            return
+        async with cls._checked_pool().acquire() as conn:
+            yield conn
+
+    @classmethod
+    @asynccontextmanager
+    async def transaction(cls, synchronous_commit: bool = True) -> AsyncIterator[Connection]:
+        """Run the async calls made inside the block in one transaction.
+        
+        The pool runs in autocommit mode, so otherwise every write commits (and
+        flushes WAL) on its own. With synchronous_commit=False the commit does
+        not wait for the WAL flush. Nested blocks join the outer transaction.
+        """
+        if _tx_conn.get() is not None:
+            yield _tx_conn.get()
+            return
+
+        async with cls._checked_pool().acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute('BEGIN')
+                if not synchronous_commit:
+                    await cur.execute('SET LOCAL synchronous_commit = off')
+            token = _tx_conn.set(conn)
+            try:
+                yield conn
+            except BaseException:
+                async with conn.cursor() as cur:
+                    await cur.execute('ROLLBACK')
+                raise
+            else:
+                async with conn.cursor() as cur:
+                    await cur.execute('COMMIT')
+            finally:
+                _tx_conn.reset(token)
+
+    @classmethod
+    async def _execute(cls, cur: Any, query: str, params: tuple) -> None:
+        """Execute a statement, via a per-connection prepared statement if enabled.
+        
+        Prepared statements live on the server connection, so the names already
+        prepared on a connection are tracked on the connection object itself.
+        """
+        if not cls.server_prepared or not params:
+            await cur.execute(query, params)
+            return
+        
+        entry = cls._prepared.get(query)
+        if entry is None:
+            name = f'odbms_stmt_{len(cls._prepared)}'
+            counter = iter(range(1, len(params) + 1))
+            body = re.sub(r'%s', lambda _: f'${next(counter)}', query)
+            entry = cls._prepared[query] = (name, f'PREPARE {name} AS {body}')
+        name, prepare = entry
+        
+        conn = cur.connection
+        prepared = getattr(conn, '_odbms_prepared', None)
+        if prepared is None:
+            prepared = set()
+            setattr(conn, '_odbms_prepared', prepared)
+        if name not in prepared:
+            await cur.execute(prepare)
+            prepared.add(name)
+        
+        await cur.execute(f'EXECUTE {name} ({", ".join(["%s"] * len(params))})', params)
 
     @classmethod
     def insert(cls, table: str, data: dict) -> Union[str, int]:
@@ -69,14 +358,19 @@ class PostgresqlDB(ORM):
         return cls._run_sync(cls.insert_async(table, data))
             
     @classmethod
-    def find(cls, table: str, filter: Optional[Dict[str, Any]] = None, columns: list = ['*']) -> List[Dict[str, Any]]:
+    def insert_many(cls, table: str, data: List[dict], binary: bool = False) -> int:
+        """Insert multiple records."""
+        return cls._run_sync(cls.insert_many_async(table, data, binary))
+            
+    @classmethod
+    def find(cls, table: str, filter: Optional[Dict[str, Any]] = None, columns: list = ['*'], cacheable: bool = False) -> List[Dict[str, Any]]:
         """Find records matching filter."""
-        return cls._run_sync(cls.find_async(table, filter or {}, columns))
+        return cls._run_sync(cls.find_async(table, filter or {}, columns, cacheable))
             
     @classmethod
-    def find_one(cls, table: str, filter: dict = {}, columns: list = ['*']) -> Optional[Dict[str, Any]]:
+    def find_one(cls, table: str, filter: dict = {}, columns: list = ['*'], cacheable: bool = False) -> Optional[Dict[str, Any]]:
         """Find one record matching filter."""
-        return cls._run_sync(cls.find_one_async(table, filter, columns))
+        return cls._run_sync(cls.find_one_async(table, filter, columns, cacheable))
             
     @classmethod
     def update(cls, table: str, filter: dict, data: dict) -> int:
@@ -89,9 +383,14 @@ class PostgresqlDB(ORM):
         return cls._run_sync(cls.remove_async(table, filter))
 
     @classmethod
-    def sum(cls, table: str, column: str, filter: dict = {}) -> Union[int, float]:
+    def count(cls, table: str, filter: dict = {}, approximate: bool = False) -> int:
+        """Count records matching filter."""
+        return cls._run_sync(cls.count_async(table, filter, approximate))
+
+    @classmethod
+    def sum(cls, table: str, column: str, filter: dict = {}, cacheable: bool = False) -> Union[int, float]:
         """Sum values in a column."""
-        return cls._run_sync(cls.sum_async(table, column, filter))
+        return cls._run_sync(cls.sum_async(table, column, filter, cacheable))
 
     @classmethod
     async def insert_async(cls, table: str, data: dict) -> Union[str, int]:
@@ -99,67 +398,170 @@ class PostgresqlDB(ORM):
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join([f'%s'] * len(data))
-        query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING id'
+        columns = tuple(sorted(data))
+        query = cls._insert_sql(table, columns)
 
-        async with cls._pool.acquire() as conn:
+        async with cls._connection() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(query, tuple(data.values()))
+                await cls._execute(cur, query, tuple(data[k] for k in columns))
                 result = await cur.fetchone()
+                cls._invalidate(table)
                 return result[0] if result else 0
 
     @classmethod
-    async def find_async(cls, table: str, filter: Optional[Dict[str, Any]] = None, columns: list = ['*']) -> List[Dict[str, Any]]:
-        """Find records matching filter asynchronously."""
+    async def insert_many_async(cls, table: str, data: List[dict], binary: bool = False) -> int:
+        """Insert multiple records asynchronously.
+        
+        Batches of copy_threshold rows or more are streamed with COPY, through
+        asyncpg's binary copy_records_to_table when asyncpg is installed; smaller
+        ones send one multi-row VALUES statement per page, all in one round trip.
+        binary=True sends any batch size through the binary COPY when asyncpg is
+        available, which avoids text formatting and parsing of numeric values.
+        The binary format needs native Python values (e.g. datetime for a
+        TIMESTAMP column); rows holding text forms such as the ISO strings from
+        Model.normalise fall back to the CSV COPY, which lets the server parse them.
+        """
         if cls._pool is None:
             raise RuntimeError("Database not connected")
+        if not data:
+            return 0
+
+        columns = tuple(sorted(data[0]))
+        check_identifiers(table, *columns)
+        # COPY runs on a dedicated connection, so it is skipped inside transaction()
+        use_copy = len(data) >= cls.copy_threshold or (binary and asyncpg is not None)
+        if use_copy and _tx_conn.get() is None:
+            total = None
+            if asyncpg is not None:
+                try:
+                    total = await cls._copy_records(table, columns, data)
+                except asyncpg.DataError:
+                    # A value asyncpg cannot encode in binary; nothing was copied
+                    total = None
+            if total is None:
+                # aiopg connections are asynchronous and cannot run COPY
+                total = await asyncio.to_thread(cls._copy_rows, table, columns, data)
+            cls._invalidate(table)
+            return total
 
-        query = f'SELECT {", ".join(columns)} FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f'{k} = %s' for k in filter.keys()])
-            query += f' WHERE {conditions}'
-            params = tuple(filter.values())
-        else:
-            params = ()
+        statements: List[str] = []
+        params: List[Any] = []
+        for start in range(0, len(data), cls.insert_chunk_size):
+            query, chunk_params = multi_row_insert(table, columns, data[start:start + cls.insert_chunk_size])
+            statements.append(query)
+            params.extend(chunk_params)
 
-        async with cls._pool.acquire() as conn:
+        # psycopg2 binds parameters client-side, so every page goes out in one
+        # simple-query message: a single round trip, run as one implicit transaction
+        async with cls._connection() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(query, params)
-                results = await cur.fetchall()
-                if not results:
-                    return []
-                
-                # Convert results to dictionaries
-                if cur.description is None:
-                    return []
-                column_names = [desc[0] for desc in cur.description]
-                return [dict(zip(column_names, row)) for row in results]
-
-    @classmethod
-    async def find_one_async(cls, table: str, filter: dict = {}, columns: list = ['*']) -> Optional[Dict[str, Any]]:
+                await cur.execute('; '.join(statements), params)
+        cls._invalidate(table)
+        return len(data)
+
+    @classmethod
+    async def _copy_records(cls, table: str, columns: tuple, data: List[dict]) -> int:
+        """Load rows with asyncpg's binary COPY over a dedicated connection."""
+        records = row_tuples(columns, data)
+        conn = await asyncpg.connect(**cls._conn_settings)
+        try:
+            status = await conn.copy_records_to_table(table, records=records, columns=list(columns))
+        finally:
+            await conn.close()
+        # Status is the command tag, e.g. 'COPY 500'
+        return int(status.split()[-1])
+
+    @classmethod
+    def _copy_rows(cls, table: str, columns: tuple, data: List[dict]) -> int:
+        """Stream rows into a table with COPY FROM STDIN over a dedicated connection."""
+        conn = psycopg2.connect(cls._dsn)
+        try:
+            with conn, conn.cursor() as cur:
+                return cls._copy_csv(cur, table, columns, data)
+        finally:
+            conn.close()
+
+    @classmethod
+    async def find_async(cls, table: str, filter: Optional[Dict[str, Any]] = None, columns: list = ['*'], cacheable: bool = False) -> List[Dict[str, Any]]:
+        """Find records matching filter asynchronously.
+        
+        With cacheable=True the result is kept in a per-table LRU until the next
+        write to that table through this class.
+        """
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+
+        filter = filter or {}
+        key = cls._cache_key('find', filter, columns) if cacheable else None
+        cached = cls._cache_get(table, key)
+        if cached is not None:
+            return cached
+        keys = tuple(sorted(filter))
+        query = cls._select_sql(table, keys, columns)
+
+        async with cls._connection() as conn:
+            async with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                await cls._execute(cur, query, tuple(filter[k] for k in keys))
+                return cls._cache_set(table, key, await cur.fetchall())
+
+    @classmethod
+    async def find_iter_async(cls, table: str, filter: Optional[Dict[str, Any]] = None, columns: list = ['*']) -> AsyncIterator[Dict[str, Any]]:
+        """Stream records matching filter through a server-side cursor.
+        
+        Only fetch_chunk_size rows are held client-side at a time. aiopg cannot
+        open named cursors, so the cursor is declared explicitly in a transaction.
+        Each call declares its own cursor name, so streams can be nested or run
+        side by side inside one transaction().
+        """
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+
+        filter = filter or {}
+        keys = tuple(sorted(filter))
+        query = cls._select_sql(table, keys, columns)
+
+        name = f'odbms_stream_{next(_stream_ids)}'
+        in_transaction = _tx_conn.get() is not None
+        async with cls._connection() as conn:
+            async with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                if not in_transaction:
+                    await cur.execute('BEGIN')
+                try:
+                    await cur.execute(f'DECLARE {name} NO SCROLL CURSOR FOR {query}', tuple(filter[k] for k in keys))
+                    while True:
+                        await cur.execute(f'FETCH {int(cls.fetch_chunk_size)} FROM {name}')
+                        rows = await cur.fetchall()
+                        if not rows:
+                            break
+                        for row in rows:
+                            yield row
+                finally:
+                    # After a failed statement the transaction is aborted: CLOSE would
+                    # raise and hide the original error, and the cursor is gone anyway
+                    failed = conn.raw.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INERROR
+                    if not in_transaction:
+                        await cur.execute('ROLLBACK' if failed else 'COMMIT')
+                    elif not failed:
+                        await cur.execute(f'CLOSE {name}')
+
+    @classmethod
+    async def find_one_async(cls, table: str, filter: dict = {}, columns: list = ['*'], cacheable: bool = False) -> Optional[Dict[str, Any]]:
         """Find one record matching filter asynchronously."""
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        query = f'SELECT {", ".join(columns)} FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f'{k} = %s' for k in filter.keys()])
-            query += f' WHERE {conditions}'
-        query += ' LIMIT 1'
+        key = cls._cache_key('find_one', filter, columns) if cacheable else None
+        cached = cls._cache_get(table, key)
+        if cached is not None:
+            return cached
 
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(query, tuple(filter.values()))
-                result = await cur.fetchone()
-                if not result:
-                    return None
-                
-                # Convert result to dictionary
-                if cur.description is None:
-                    return None
-                column_names = [desc[0] for desc in cur.description]
-                return dict(zip(column_names, result))
+        keys = tuple(sorted(filter))
+        query = cls._select_sql(table, keys, columns, limit_one=True)
+
+        async with cls._connection() as conn:
+            async with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                await cls._execute(cur, query, tuple(filter[k] for k in keys))
+                return cls._cache_set(table, key, await cur.fetchone())
 
     @classmethod
     async def update_async(cls, table: str, filter: dict, data: dict) -> int:
@@ -167,18 +569,15 @@ class PostgresqlDB(ORM):
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        set_clause = ', '.join([f"{k} = %s" for k in data.keys()])
-        query = f'UPDATE {table} SET {set_clause}'
-        
-        params = list(data.values())
-        if filter:
-            conditions = ' AND '.join([f"{k} = %s" for k in filter.keys()])
-            query += f' WHERE {conditions}'
-            params.extend(filter.values())
+        columns = tuple(sorted(data))
+        keys = tuple(sorted(filter))
+        query = cls._update_sql(table, columns, keys)
+        params = tuple(data[k] for k in columns) + tuple(filter[k] for k in keys)
 
-        async with cls._pool.acquire() as conn:
+        async with cls._connection() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(query, tuple(params))
+                await cls._execute(cur, query, params)
+                cls._invalidate(table)
                 return cur.rowcount
 
     @classmethod
@@ -187,29 +586,260 @@ class PostgresqlDB(ORM):
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        query = f'DELETE FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f"{k} = %s" for k in filter.keys()])
-            query += f' WHERE {conditions}'
+        keys = tuple(sorted(filter))
+        query = cls._delete_sql(table, keys)
 
-        async with cls._pool.acquire() as conn:
+        async with cls._connection() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(query, tuple(filter.values()))
+                await cls._execute(cur, query, tuple(filter[k] for k in keys))
+                cls._invalidate(table)
                 return cur.rowcount
 
     @classmethod
-    async def sum_async(cls, table: str, column: str, filter: dict = {}) -> Union[int, float]:
+    async def count_async(cls, table: str, filter: dict = {}, approximate: bool = False) -> int:
+        """Count records matching filter asynchronously.
+        
+        With approximate=True and no filter, the planner's pg_class.reltuples
+        estimate is used instead of a full scan and cached for
+        approximate_count_ttl seconds. Tables never analyzed fall back to COUNT(*).
+        """
+        if cls._pool is None:
+            raise RuntimeError("Database not connected")
+
+        if approximate and not filter:
+            cached = cls._approx_count_get(table)
+            if cached is not None:
+                return cached
+            async with cls._connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", (table,))
+                    result = await cur.fetchone()
+            # reltuples is -1 until the table is first vacuumed or analyzed
+            if result and result[0] is not None and result[0] >= 0:
+                return cls._approx_count_set(table, int(result[0]))
+
+        keys = tuple(sorted(filter))
+        query = cls._count_sql(table, keys)
+
+        async with cls._connection() as conn:
+            async with conn.cursor() as cur:
+                await cls._execute(cur, query, tuple(filter[k] for k in keys))
+                result = await cur.fetchone()
+                return int(result[0]) if result else 0
+
+    @classmethod
+    async def sum_async(cls, table: str, column: str, filter: dict = {}, cacheable: bool = False) -> Union[int, float]:
         """Sum values in a column asynchronously."""
         if cls._pool is None:
             raise RuntimeError("Database not connected")
 
-        query = f'SELECT SUM({column}) as total FROM {table}'
-        if filter:
-            conditions = ' AND '.join([f'{k} = %s' for k in filter.keys()])
-            query += f' WHERE {conditions}'
+        key = cls._cache_key('sum', filter, [column]) if cacheable else None
+        cached = cls._cache_get(table, key)
+        if cached is not None:
+            return cached
 
-        async with cls._pool.acquire() as conn:
+        keys = tuple(sorted(filter))
+        query = cls._sum_sql(table, column, keys)
+
+        async with cls._connection() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(query, tuple(filter.values()))
+                await cls._execute(cur, query, tuple(filter[k] for k in keys))
                 result = await cur.fetchone()
-                return float(result[0]) if result and result[0] is not None else 0
\ No newline at end of file
+                total = float(result[0]) if result and result[0] is not None else 0
+                return cls._cache_set(table, key, total)
+
+class PostgresqlDBSync(_PostgresqlSQL, ORM):
+    """PostgreSQL backend whose sync API calls psycopg2 directly.
+    
+    Sync calls skip coroutine and event-loop scheduling entirely. The async
+    methods run their sync counterparts in a worker thread, as MongoDB does;
+    use PostgresqlDB for transaction() and find_iter_async.
+    """
+    _sync_pool: Optional[ThreadedConnectionPool] = None
+
+    @classmethod
+    def connect(cls, dbsettings: dict) -> None:
+        '''Connection method'''
+        minconn = dbsettings.get('pool_min', 10)
+        maxconn = dbsettings.get('pool_max', 32)
+        cls._sync_pool = cls._open_pool(dbsettings, lambda dsn: ThreadedConnectionPool(minconn, maxconn, dsn))
+
+    @classmethod
+    def disconnect(cls) -> None:
+        """Disconnect from PostgreSQL."""
+        if cls._sync_pool is not None:
+            cls._sync_pool.closeall()
+            cls._sync_pool = None
+
+    @classmethod
+    @contextmanager
+    def _sync_connection(cls) -> Iterator[Any]:
+        """Borrow a pooled psycopg2 connection, committing on success."""
+        if cls._sync_pool is None:
+            raise RuntimeError("Database not connected")
+        conn = cls._sync_pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cls._sync_pool.putconn(conn)
+
+    @classmethod
+    def insert(cls, table: str, data: dict) -> Union[str, int]:
+        """Insert a record."""
+        columns = tuple(sorted(data))
+        with cls._sync_connection() as conn, conn.cursor() as cur:
+            cur.execute(cls._insert_sql(table, columns), tuple(data[k] for k in columns))
+            result = cur.fetchone()
+        cls._invalidate(table)
+        return result[0] if result else 0
+
+    @classmethod
+    def insert_many(cls, table: str, data: List[dict], binary: bool = False) -> int:
+        """Insert multiple records, with COPY for batches of copy_threshold rows or more.
+        
+        binary is accepted for signature compatibility with PostgresqlDB and
+        ignored: psycopg2 only offers the CSV COPY used here.
+        """
+        if not data:
+            return 0
+
+        columns = tuple(sorted(data[0]))
+        check_identifiers(table, *columns)
+        with cls._sync_connection() as conn, conn.cursor() as cur:
+            if len(data) >= cls.copy_threshold:
+                cls._copy_csv(cur, table, columns, data)
+            else:
+                # execute_values expands the single %s into insert_chunk_size rows per statement
+                query = cached_sql(('pg_insert_values', table, columns), lambda: (
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+                ))
+                execute_values(cur, query, row_tuples(columns, data), page_size=cls.insert_chunk_size)
+        cls._invalidate(table)
+        return len(data)
+
+    @classmethod
+    def find(cls, table: str, filter: Optional[Dict[str, Any]] = None, columns: list = ['*'], cacheable: bool = False) -> List[Dict[str, Any]]:
+        """Find records matching filter."""
+        filter = filter or {}
+        key = cls._cache_key('find', filter, columns) if cacheable else None
+        cached = cls._cache_get(table, key)
+        if cached is not None:
+            return cached
+
+        keys = tuple(sorted(filter))
+        with cls._sync_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(cls._select_sql(table, keys, columns), tuple(filter[k] for k in keys))
+            return cls._cache_set(table, key, cur.fetchall())
+
+    @classmethod
+    def find_one(cls, table: str, filter: dict = {}, columns: list = ['*'], cacheable: bool = False) -> Optional[Dict[str, Any]]:
+        """Find one record matching filter."""
+        key = cls._cache_key('find_one', filter, columns) if cacheable else None
+        cached = cls._cache_get(table, key)
+        if cached is not None:
+            return cached
+
+        keys = tuple(sorted(filter))
+        with cls._sync_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(cls._select_sql(table, keys, columns, limit_one=True), tuple(filter[k] for k in keys))
+            return cls._cache_set(table, key, cur.fetchone())
+
+    @classmethod
+    def update(cls, table: str, filter: dict, data: dict) -> int:
+        """Update records matching filter."""
+        columns = tuple(sorted(data))
+        keys = tuple(sorted(filter))
+        params = tuple(data[k] for k in columns) + tuple(filter[k] for k in keys)
+        with cls._sync_connection() as conn, conn.cursor() as cur:
+            cur.execute(cls._update_sql(table, columns, keys), params)
+            rowcount = cur.rowcount
+        cls._invalidate(table)
+        return rowcount
+
+    @classmethod
+    def remove(cls, table: str, filter: dict) -> int:
+        """Remove records matching filter."""
+        keys = tuple(sorted(filter))
+        with cls._sync_connection() as conn, conn.cursor() as cur:
+            cur.execute(cls._delete_sql(table, keys), tuple(filter[k] for k in keys))
+            rowcount = cur.rowcount
+        cls._invalidate(table)
+        return rowcount
+
+    @classmethod
+    def count(cls, table: str, filter: dict = {}, approximate: bool = False) -> int:
+        """Count records matching filter, see PostgresqlDB.count_async for approximate."""
+        if approximate and not filter:
+            cached = cls._approx_count_get(table)
+            if cached is not None:
+                return cached
+            with cls._sync_connection() as conn, conn.cursor() as cur:
+                cur.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", (table,))
+                result = cur.fetchone()
+            if result and result[0] is not None and result[0] >= 0:
+                return cls._approx_count_set(table, int(result[0]))
+
+        keys = tuple(sorted(filter))
+        with cls._sync_connection() as conn, conn.cursor() as cur:
+            cur.execute(cls._count_sql(table, keys), tuple(filter[k] for k in keys))
+            result = cur.fetchone()
+        return int(result[0]) if result else 0
+
+    @classmethod
+    def sum(cls, table: str, column: str, filter: dict = {}, cacheable: bool = False) -> Union[int, float]:
+        """Sum values in a column."""
+        key = cls._cache_key('sum', filter, [column]) if cacheable else None
+        cached = cls._cache_get(table, key)
+        if cached is not None:
+            return cached
+
+        keys = tuple(sorted(filter))
+        with cls._sync_connection() as conn, conn.cursor() as cur:
+            cur.execute(cls._sum_sql(table, column, keys), tuple(filter[k] for k in keys))
+            result = cur.fetchone()
+        total = float(result[0]) if result and result[0] is not None else 0
+        return cls._cache_set(table, key, total)
+
+    @classmethod
+    async def insert_async(cls, table: str, data: dict) -> Union[str, int]:
+        """Insert a record asynchronously."""
+        return await asyncio.to_thread(cls.insert, table, data)
+
+    @classmethod
+    async def insert_many_async(cls, table: str, data: List[dict], binary: bool = False) -> int:
+        """Insert multiple records asynchronously."""
+        return await asyncio.to_thread(cls.insert_many, table, data, binary)
+
+    @classmethod
+    async def find_async(cls, table: str, filter: Optional[Dict[str, Any]] = None, columns: list = ['*'], cacheable: bool = False) -> List[Dict[str, Any]]:
+        """Find records matching filter asynchronously."""
+        return await asyncio.to_thread(cls.find, table, filter, columns, cacheable)
+
+    @classmethod
+    async def find_one_async(cls, table: str, filter: dict = {}, columns: list = ['*'], cacheable: bool = False) -> Optional[Dict[str, Any]]:
+        """Find one record matching filter asynchronously."""
+        return await asyncio.to_thread(cls.find_one, table, filter, columns, cacheable)
+
+    @classmethod
+    async def update_async(cls, table: str, filter: dict, data: dict) -> int:
+        """Update records matching filter asynchronously."""
+        return await asyncio.to_thread(cls.update, table, filter, data)
+
+    @classmethod
+    async def remove_async(cls, table: str, filter: dict) -> int:
+        """Remove records matching filter asynchronously."""
+        return await asyncio.to_thread(cls.remove, table, filter)
+
+    @classmethod
+    async def count_async(cls, table: str, filter: dict = {}, approximate: bool = False) -> int:
+        """Count records matching filter asynchronously."""
+        return await asyncio.to_thread(cls.count, table, filter, approximate)
+
+    @classmethod
+    async def sum_async(cls, table: str, column: str, filter: dict = {}, cacheable: bool = False) -> Union[int, float]:
+        """Sum values in a column asynchronously."""
+        return await asyncio.to_thread(cls.sum, table, column, filter, cacheable)
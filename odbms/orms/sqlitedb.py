@@ -7,103 +7,362 @@
 
 from datetime import datetime
 import sqlite3
-from typing import Optional, Dict, Any, List
+import sys
+import queue
+from pathlib import Path
+from functools import lru_cache
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Iterable, Tuple
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from ..dbms import Database
+from .base import cached_sql, row_tuples
+
+# Column name endings treated as datetimes ('_at' also matches anywhere in the name)
+_DT_SUFFIX = ('_at', 'date')
+
+@lru_cache(maxsize=1024)
+def _sqlite_timestamp(value: str) -> str:
+    """Reformat an ISO datetime string as an SQLite timestamp; raises ValueError if unparsable."""
+    return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
 
 class SQLiteDB(Database):
     """SQLite database implementation."""
     
+    # Compiled statements kept per connection by sqlite3, keyed by SQL text
+    cached_statements: int = 256
+    
+    # Pooled read connections of a file database; readers beyond this wait for a free one
+    pool_size: int = 4
+    
+    # Per-table LRU size for find_one(..., cache=True) results
+    cache_size: int = 128
+    
+    # Applied to every connection of a file database (moot for :memory:)
+    pragmas: tuple = (
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "busy_timeout=5000",
+        "temp_store=MEMORY",
+        "mmap_size=268435456",
+        "cache_size=-64000",
+    )
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.dbms = 'sqlite'
-        self._connection = None
+        self._connection = None  # Single write connection
         self._cursor = None
-        self._executor = ThreadPoolExecutor(max_workers=4)  # Pool for async operations
+        self._read_pool: Optional[queue.Queue] = None
+        self._write_lock = threading.Lock()  # SQLite allows one writer at a time
+        self._async_write_lock: Optional[asyncio.Lock] = None  # Queues async writers before they take a thread
         self._loop = None
+        # Datetime-looking columns per (table, columns) insert shape
+        self._datetime_columns: Dict[tuple, tuple] = {}
+        # Opt-in find_one results: table -> LRU of params -> row, dropped on writes
+        self._result_cache: Dict[str, OrderedDict] = {}
+        self._cache_lock = threading.Lock()
         # Use a shared in-memory database
         self._uri = 'file::memory:?cache=shared'
     
     def connect(self):
         """Connect to SQLite."""
         if self._connection is None:
-            self._connection = sqlite3.connect(
-                self._uri if self.config.get('database', ':memory:') == ':memory:' else self.config['database'],
-                uri=True,
-                check_same_thread=False  # Allow access from other threads
-            )
-            self._connection.row_factory = sqlite3.Row
+            self._connection = self._get_connection()
             self._cursor = self._connection.cursor()
+            # Shared-cache readers of an in-memory database take table locks and fail
+            # at once with SQLITE_LOCKED (not retried by busy_timeout) while a write
+            # is open, so in-memory databases read on the write connection instead
+            if self.config.get('database', ':memory:') != ':memory:':
+                self._read_pool = queue.Queue(maxsize=self.pool_size)
+                for _ in range(self.pool_size):
+                    self._read_pool.put(self._get_connection(readonly=True))
     
     def disconnect(self):
         """Disconnect from SQLite."""
+        if self._read_pool is not None:
+            while not self._read_pool.empty():
+                self._read_pool.get_nowait().close()
+            self._read_pool = None
         if self._cursor:
             self._cursor.close()
         if self._connection:
             self._connection.close()
             self._connection = None
             self._cursor = None
-        if self._executor:
-            self._executor.shutdown(wait=False)
-            self._executor = None
         self._loop = None
     
     async def _ensure_loop(self):
         """Ensure we have a valid event loop."""
-        if self._loop is None or self._loop.is_closed():
-            self._loop = asyncio.get_running_loop()
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._async_write_lock = asyncio.Lock()
         return self._loop
     
-    async def _run_in_executor(self, func, *args, **kwargs):
-        """Run a function in the thread pool executor."""
-        if self._executor is None:
-            self._executor = ThreadPoolExecutor(max_workers=4)
-        loop = await self._ensure_loop()
-        return await loop.run_in_executor(self._executor, func, *args, **kwargs)
+    async def _run_write(self, func, *args):
+        """Run a write in a worker thread, one at a time, so waiting writers don't tie up workers."""
+        await self._ensure_loop()
+        async with self._async_write_lock:
+            return await asyncio.to_thread(func, *args)
     
-    def _get_connection(self):
-        """Get a new connection for thread-safe operations."""
+    def _get_connection(self, readonly: bool = False):
+        """Open a new connection; used to fill the writer slot and the read pool."""
+        database = self.config.get('database', ':memory:')
+        if database == ':memory:':
+            target = self._uri
+        elif readonly and not database.startswith('file:'):
+            # Pooled readers never write, so open file databases read-only
+            target = Path(database).resolve().as_uri() + '?mode=ro'
+        else:
+            target = database
         conn = sqlite3.connect(
-            self._uri if self.config.get('database', ':memory:') == ':memory:' else self.config['database'],
+            target,
             uri=True,
-            check_same_thread=False
+            check_same_thread=False,  # Allow access from other threads
+            cached_statements=self.cached_statements
         )
         conn.row_factory = sqlite3.Row
+        if database != ':memory:':
+            for pragma in self.pragmas:
+                conn.execute(f"PRAGMA {pragma}")
         return conn
     
+    @contextmanager
+    def _reader(self):
+        """Borrow a connection from the read pool, or the write connection for :memory:."""
+        self.connect()
+        pool = self._read_pool
+        if pool is None:
+            with self._write_lock:
+                yield self._connection
+            return
+        conn = pool.get()
+        try:
+            yield conn
+        finally:
+            pool.put(conn)
+    
+    @contextmanager
+    def _writer(self, table: Optional[str] = None):
+        """Hold the write connection; commits on success, rolls back on error.
+        
+        Cached find_one results for table, or for every table if none is given, are dropped.
+        """
+        self.connect()
+        try:
+            with self._write_lock, self._connection as conn:
+                yield conn
+        finally:
+            self._invalidate(table)
+    
+    def _cache_get(self, table: str, key: Optional[Tuple]) -> Optional[Dict]:
+        """Return a cached find_one row for table/key, or None on a miss."""
+        with self._cache_lock:
+            entries = self._result_cache.get(table)
+            if key is None or entries is None or key not in entries:
+                return None
+            entries.move_to_end(key)
+            return dict(entries[key])
+    
+    def _cache_set(self, table: str, key: Optional[Tuple], row: Optional[Dict]):
+        """Store a find_one row in the table's LRU."""
+        if key is None or row is None:
+            return
+        with self._cache_lock:
+            entries = self._result_cache.setdefault(table, OrderedDict())
+            entries[key] = dict(row)
+            if len(entries) > self.cache_size:
+                entries.popitem(last=False)
+    
+    def _invalidate(self, table: Optional[str] = None):
+        """Drop cached results for a table, or for every table if none is given."""
+        with self._cache_lock:
+            if table is None:
+                self._result_cache.clear()
+            else:
+                self._result_cache.pop(table, None)
+    
+    @staticmethod
+    def _build_select(table: str, param_keys: Iterable[str], limit_one: bool = False) -> str:
+        """Return the SELECT text for a table and filter keys, built once per shape."""
+        keys = tuple(sorted(param_keys))  # Named parameters, so filter order never changes the statement
+        def build():
+            query = f"SELECT * FROM {table}"
+            if keys:
+                query += " WHERE " + " AND ".join(f"{k} = :{k}" for k in keys)
+            if limit_one:
+                query += " LIMIT 1"
+            return sys.intern(query)
+        return cached_sql(('sqlite_select', table, keys, limit_one), build)
+    
+    @staticmethod
+    def _build_select_in(table: str, column: str, size: int) -> str:
+        """Return the SELECT ... WHERE column IN (?, ...) text for `size` values."""
+        return cached_sql(('sqlite_select_in', table, column, size), lambda: sys.intern(
+            f"SELECT * FROM {table} WHERE {column} IN ({', '.join(['?'] * size)})"
+        ))
+    
+    @staticmethod
+    def _build_count(table: str, param_keys: Iterable[str]) -> str:
+        """Return the SELECT COUNT(*) text for a table and filter keys, built once per shape."""
+        keys = tuple(sorted(param_keys))
+        def build():
+            query = f"SELECT COUNT(*) FROM {table}"
+            if keys:
+                query += " WHERE " + " AND ".join(f"{k} = :{k}" for k in keys)
+            return sys.intern(query)
+        return cached_sql(('sqlite_count', table, keys), build)
+    
+    @staticmethod
+    def _build_insert(table: str, columns: Iterable[str], positional: bool = False) -> str:
+        """Return the INSERT text for a table and column names, built once per shape.
+        
+        Values are bound by name (:column) unless positional is set, in which case
+        they are bound with ? placeholders in column order.
+        """
+        columns = tuple(columns)
+        def build():
+            placeholders = ['?'] * len(columns) if positional else [f':{k}' for k in columns]
+            return sys.intern(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+            )
+        return cached_sql(('sqlite_insert', table, columns, positional), build)
+    
+    @staticmethod
+    def _build_update(table: str, param_keys: Iterable[str], columns: Iterable[str]) -> str:
+        """Return the UPDATE text; filter values are bound as :where_<key>."""
+        keys, columns = tuple(sorted(param_keys)), tuple(sorted(columns))
+        return cached_sql(('sqlite_update', table, keys, columns), lambda: sys.intern(
+            f"UPDATE {table} SET {', '.join(f'{k} = :{k}' for k in columns)} "
+            f"WHERE {' AND '.join(f'{k} = :where_{k}' for k in keys)}"
+        ))
+    
+    @staticmethod
+    def _build_delete(table: str, param_keys: Iterable[str]) -> str:
+        """Return the DELETE text for a table and filter keys, built once per shape."""
+        keys = tuple(sorted(param_keys))
+        return cached_sql(('sqlite_delete', table, keys), lambda: sys.intern(
+            f"DELETE FROM {table} WHERE {' AND '.join(f'{k} = :{k}' for k in keys)}"
+        ))
+    
+    @staticmethod
+    def _columns(cursor) -> tuple:
+        """Return the interned column names of a cursor's current result."""
+        return tuple(sys.intern(column[0]) for column in cursor.description)
+    
     def execute(self, query: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """Execute a query."""
-        with self._get_connection() as conn:
+        with self._writer() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params or {})
-            conn.commit()
             return cursor
     
+    def executescript(self, script: str) -> None:
+        """Execute several ;-separated statements in one call on the write connection."""
+        with self._writer() as conn:
+            conn.executescript(script)
+    
     def find(self, table: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """Find records matching params."""
-        query = f"SELECT * FROM {table}"
-        if params:
-            conditions = " AND ".join(f"{k} = :{k}" for k in params.keys())
-            query += f" WHERE {conditions}"
+        query = self._build_select(table, params or ())
         
-        with self._get_connection() as conn:
+        with self._reader() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None  # Plain tuples; rows are zipped with one shared column tuple
             cursor.execute(query, params or {})
-            return [dict(row) for row in cursor.fetchall()]
+            rows = cursor.fetchall()
+            columns = self._columns(cursor)
+            return [dict(zip(columns, row)) for row in rows]
     
-    def find_one(self, table: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
-        """Find one record matching params."""
-        query = f"SELECT * FROM {table}"
-        if params:
-            conditions = " AND ".join(f"{k} = :{k}" for k in params.keys())
-            query += f" WHERE {conditions} LIMIT 1"
+    def find_in(self, table: str, column: str, values: Iterable[Any]) -> List[Dict]:
+        """Find records whose column matches any of values, in one query."""
+        values = tuple(values)
+        if not values:
+            return []
+        query = self._build_select_in(table, column, len(values))
         
-        with self._get_connection() as conn:
+        with self._reader() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, values)
+            rows = cursor.fetchall()
+            columns = self._columns(cursor)
+            return [dict(zip(columns, row)) for row in rows]
+    
+    def find_one(self, table: str, params: Optional[Dict[str, Any]] = None, cache: bool = False) -> Optional[Dict]:
+        """Find one record matching params.
+        
+        With cache=True the row is served from and stored in a per-table LRU that
+        is dropped on any write through this instance (not other processes).
+        """
+        key = None
+        if cache and self.cache_size > 0:
+            try:
+                key = frozenset((params or {}).items())
+            except TypeError:  # Unhashable filter values are never cached
+                key = None
+            row = self._cache_get(table, key)
+            if row is not None:
+                return row
+        
+        query = self._build_select(table, params or (), limit_one=True)
+        
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute(query, params or {})
             row = cursor.fetchone()
-            return dict(row) if row else None
+            columns = self._columns(cursor)
+            cursor.close()  # Reset the statement before the connection goes back to the pool
+        
+        result = dict(zip(columns, row)) if row else None
+        self._cache_set(table, key, result)
+        return result
+    
+    def _datetime_keys(self, table: str, data: dict) -> tuple:
+        """Return the keys of data that look like datetime columns, computed once per shape."""
+        shape = (table, tuple(data))
+        keys = self._datetime_columns.get(shape)
+        if keys is None:
+            keys = self._datetime_columns[shape] = tuple(
+                key for key in data if key.endswith(_DT_SUFFIX) or '_at' in key
+            )
+        return keys
+    
+    @staticmethod
+    def _to_timestamp(value: Any) -> Any:
+        """Reformat an ISO datetime string as an SQLite timestamp; other values pass through."""
+        if isinstance(value, str):
+            try:
+                return _sqlite_timestamp(value)
+            except ValueError:
+                pass  # Keep original value if parsing fails
+        return value
+    
+    @classmethod
+    def _convert_datetimes(cls, keys: tuple, rows: Iterable[dict]):
+        """Reformat ISO datetime strings under keys in each row, in place."""
+        for row in rows:
+            for key in keys:
+                row[key] = cls._to_timestamp(row[key])
+    
+    @classmethod
+    def _timestamp_row(cls, row: tuple, positions: List[int]) -> tuple:
+        """Return a copy of a parameter tuple with the values at positions converted."""
+        values = list(row)
+        for i in positions:
+            values[i] = cls._to_timestamp(values[i])
+        return tuple(values)
+    
+    def count(self, table: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Count records matching params."""
+        query = self._build_count(table, params or ())
+        
+        with self._reader() as conn:
+            row = conn.execute(query, params or {}).fetchone()
+            return row[0] if row else 0
     
     def insert(self, table: str, data: dict) -> Any:
         """Insert a record."""
@@ -114,26 +373,13 @@ class SQLiteDB(Database):
             del data['id']
         
         # Convert datetime strings to proper SQLite timestamp format
-
-        for key, value in data.items():
-
-            if isinstance(value, str) and ('_at' in key or key.endswith('date')):
-                try:
-                    # Try to parse and format as SQLite timestamp
-                    dt = datetime.fromisoformat(value)
-                    data[key] = dt.strftime('%Y-%m-%d %H:%M:%S')
-
-                except ValueError:
-                    pass  # Keep original value if parsing fails
+        self._convert_datetimes(self._datetime_keys(table, data), (data,))
         
-        columns = ", ".join(data.keys())
-        placeholders = ", ".join(f":{k}" for k in data.keys())
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        query = self._build_insert(table, data)
         
-        with self._get_connection() as conn:
+        with self._writer(table) as conn:
             cursor = conn.cursor()
             cursor.execute(query, data)
-            conn.commit()
             return cursor.lastrowid
     
     def insert_many(self, table: str, data: List[dict]) -> Any:
@@ -141,62 +387,74 @@ class SQLiteDB(Database):
         if not data:
             return None
         
-        columns = ", ".join(data[0].keys())
-        placeholders = ", ".join(f":{k}" for k in data[0].keys())
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        # Bind by position: values are pulled per row with one itemgetter instead of
+        # sqlite3 looking up each named parameter in each row dict
+        columns = tuple(data[0])
+        query = self._build_insert(table, columns, positional=True)
+        
+        # Same timestamp format as insert; the datetime keys are resolved once per
+        # batch and converted in the parameter tuples, leaving the caller's dicts alone
+        rows = row_tuples(columns, data)
+        datetime_keys = self._datetime_keys(table, data[0])
+        if datetime_keys:
+            positions = [columns.index(key) for key in datetime_keys]
+            rows = [self._timestamp_row(row, positions) for row in rows]
         
-        with self._get_connection() as conn:
+        # The writer context wraps the whole batch in one transaction
+        with self._writer(table) as conn:
             cursor = conn.cursor()
-            cursor.executemany(query, data)
-            conn.commit()
+            cursor.executemany(query, rows)
             return cursor.rowcount
     
     def update(self, table: str, params: dict, data: dict) -> Any:
         """Update records matching params."""
-        set_values = ", ".join(f"{k} = :{k}" for k in data.keys())
-        conditions = " AND ".join(f"{k} = :where_{k}" for k in params.keys())
-        query = f"UPDATE {table} SET {set_values} WHERE {conditions}"
+        query = self._build_update(table, params, data)
         
         # Prefix param keys with 'where_' to avoid conflicts
         params_with_prefix = {f"where_{k}": v for k, v in params.items()}
         
-        with self._get_connection() as conn:
+        with self._writer(table) as conn:
             cursor = conn.cursor()
             cursor.execute(query, {**data, **params_with_prefix})
-            conn.commit()
             return cursor.rowcount
     
     def remove(self, table: str, params: dict) -> Any:
         """Remove records matching params."""
-        conditions = " AND ".join(f"{k} = :{k}" for k in params.keys())
-        query = f"DELETE FROM {table} WHERE {conditions}"
+        query = self._build_delete(table, params)
         
-        with self._get_connection() as conn:
+        with self._writer(table) as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            conn.commit()
             return cursor.rowcount
     
     async def find_async(self, table: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """Find records matching params asynchronously."""
-        return await self._run_in_executor(self.find, table, params)
+        return await asyncio.to_thread(self.find, table, params)
     
-    async def find_one_async(self, table: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+    async def find_in_async(self, table: str, column: str, values: Iterable[Any]) -> List[Dict]:
+        """Find records whose column matches any of values asynchronously."""
+        return await asyncio.to_thread(self.find_in, table, column, values)
+    
+    async def find_one_async(self, table: str, params: Optional[Dict[str, Any]] = None, cache: bool = False) -> Optional[Dict]:
         """Find one record matching params asynchronously."""
-        return await self._run_in_executor(self.find_one, table, params)
+        return await asyncio.to_thread(self.find_one, table, params, cache)
+    
+    async def count_async(self, table: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Count records matching params asynchronously."""
+        return await asyncio.to_thread(self.count, table, params)
     
     async def insert_async(self, table: str, data: dict) -> Any:
         """Insert a record asynchronously."""
-        return await self._run_in_executor(self.insert, table, data)
+        return await self._run_write(self.insert, table, data)
     
     async def insert_many_async(self, table: str, data: List[dict]) -> Any:
         """Insert multiple records asynchronously."""
-        return await self._run_in_executor(self.insert_many, table, data)
+        return await self._run_write(self.insert_many, table, data)
     
     async def update_async(self, table: str, params: dict, data: dict) -> Any:
         """Update records matching params asynchronously."""
-        return await self._run_in_executor(self.update, table, params, data)
+        return await self._run_write(self.update, table, params, data)
     
     async def remove_async(self, table: str, params: dict) -> Any:
         """Remove records matching params asynchronously."""
-        return await self._run_in_executor(self.remove, table, params)
\ No newline at end of file
+        return await self._run_write(self.remove, table, params)
\ No newline at end of file
@@ -1,8 +1,9 @@
 import re
 
+_EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+
 def validate_email(email): 
-  pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+.[A-Z|a-z]{2,}\b'
-  match =  re.fullmatch(pattern, email)
+  match = _EMAIL_RE.fullmatch(email)
   
   if not match:
       raise TypeError('Provide a valid email address')
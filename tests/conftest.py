@@ -1,6 +1,48 @@
 import pytest
+from types import MappingProxyType
 from odbms.dbms import DBMS
 
+# Recreated rather than CREATE IF NOT EXISTS: the shared in-memory database may
+# still hold a same-named table another test module created with other columns
+_SCHEMA = """
+    DROP TABLE IF EXISTS posts;
+    DROP TABLE IF EXISTS users;
+    DROP TABLE IF EXISTS addresses;
+    
+    CREATE TABLE addresses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        street TEXT NOT NULL,
+        city TEXT NOT NULL,
+        country TEXT NOT NULL,
+        postal_code TEXT,
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP
+    );
+    
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        age INTEGER,
+        address_id INTEGER,
+        posts_ids TEXT,
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP,
+        FOREIGN KEY (address_id) REFERENCES addresses (id)
+    );
+    
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        published BOOLEAN DEFAULT 0,
+        user_id INTEGER,
+        created_at TIMESTAMP,
+        updated_at TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    );
+"""
+
 @pytest.fixture(scope="session")
 def database():
     """Initialize database for testing."""
@@ -11,88 +53,67 @@ def database():
     
     # Create tables
     if DBMS.Database is not None and DBMS.Database.dbms != 'mongodb':
-        DBMS.Database.execute("""
-            CREATE TABLE IF NOT EXISTS addresses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                street TEXT NOT NULL,
-                city TEXT NOT NULL,
-                country TEXT NOT NULL,
-                postal_code TEXT
-            )
-        """)
-        
-        DBMS.Database.execute("""
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                published BOOLEAN DEFAULT 0,
-                user_id INTEGER,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        """)
-        
-        DBMS.Database.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                age INTEGER,
-                address_id INTEGER,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP,
-                FOREIGN KEY (address_id) REFERENCES addresses (id)
-            )
-        """)
+        DBMS.Database.executescript(_SCHEMA)
     
     yield DBMS.Database
     
     # Cleanup
     if DBMS.Database is not None:
         if DBMS.Database.dbms != 'mongodb':
-            DBMS.Database.execute("DROP TABLE IF EXISTS users")
-            DBMS.Database.execute("DROP TABLE IF EXISTS posts")
-            DBMS.Database.execute("DROP TABLE IF EXISTS addresses")
+            DBMS.Database.executescript(
+                "DROP TABLE IF EXISTS users; DROP TABLE IF EXISTS posts; DROP TABLE IF EXISTS addresses;"
+            )
         else:
-            DBMS.Database.remove('users', {})
-            DBMS.Database.remove('posts', {})
-            DBMS.Database.remove('addresses', {})
+            DBMS.Database.bulk_clear(['users', 'posts', 'addresses'])
         DBMS.Database.disconnect()
 
-@pytest.fixture
+TEST_DATA = MappingProxyType({
+    'address_data': MappingProxyType({
+        'street': '123 Main St',
+        'city': 'Test City',
+        'country': 'Test Country',
+        'postal_code': '12345'
+    }),
+    'user_data': MappingProxyType({
+        'name': 'John Doe',
+        'email': 'john@example.com',
+        'age': 30
+    }),
+    'post_data': MappingProxyType({
+        'title': 'Test Post',
+        'content': 'Test Content',
+        'published': True
+    })
+})
+
+@pytest.fixture(scope="session")
 def test_data():
-    """Test data fixture."""
-    return {
-        'address_data': {
-            'street': '123 Main St',
-            'city': 'Test City',
-            'country': 'Test Country',
-            'postal_code': '12345'
-        },
-        'user_data': {
-            'name': 'John Doe',
-            'email': 'john@example.com',
-            'age': 30
-        },
-        'post_data': {
-            'title': 'Test Post',
-            'content': 'Test Content',
-            'published': True
-        }
-    }
+    """Read-only test payloads; copy a payload before changing it."""
+    return TEST_DATA
+
+def _clear_sqlite(database):
+    database.executescript(
+        "BEGIN; DELETE FROM addresses; DELETE FROM posts; DELETE FROM users; COMMIT;"
+    )
+
+def _clear_sql(database):
+    database.execute("DELETE FROM addresses")
+    database.execute("DELETE FROM posts")
+    database.execute("DELETE FROM users")
+
+def _clear_mongodb(database):
+    database.bulk_clear(['addresses', 'posts', 'users'])
+
+@pytest.fixture(scope="session")
+def clear_tables(database):
+    """Pick the per-test table reset for the active backend once per session."""
+    if database is None:
+        return lambda: None
+    clear = {'sqlite': _clear_sqlite, 'mongodb': _clear_mongodb}.get(database.dbms, _clear_sql)
+    return lambda: clear(database)
 
 @pytest.fixture(autouse=True)
-def cleanup(database):
+def cleanup(clear_tables):
     """Clean up after each test."""
     yield
-        
-    if database is not None:
-        if database.dbms != 'mongodb':
-            database.execute("DELETE FROM addresses")
-            database.execute("DELETE FROM posts")
-            database.execute("DELETE FROM users")
-        else:
-            database.remove('addresses', {})
-            database.remove('posts', {})
-            database.remove('users', {})
-        database.disconnect()
\ No newline at end of file
+    clear_tables()
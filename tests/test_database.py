@@ -93,6 +93,15 @@ def test_insert_many(database):
     records = database.find('users')
     assert len(records) == 2
 
+def test_insert_many_leaves_input_rows_unchanged(database):
+    """Timestamps are converted for storage without rewriting the caller's dicts."""
+    rows = [
+        {'name': 'John Doe', 'email': f'john{id(object())}@example.com', 'age': 30,
+         'created_at': '2024-01-02T03:04:05.123456'},
+    ]
+    database.insert_many('users', rows)
+    assert rows[0]['created_at'] == '2024-01-02T03:04:05.123456'
+
 def test_find(database, test_data):
     """Test finding records."""
     # Insert test data
@@ -221,4 +230,59 @@ async def test_async_model_operations(test_data):
     
     # Verify deletion
     deleted_user = await User.get_async(user.id)
-    assert deleted_user is None 
\ No newline at end of file
+    assert deleted_user is None 
+def test_orm_result_cache_is_per_owner_and_copied():
+    """Cached results are private to one ORM and handed out as copies."""
+    from odbms.orms.base import ORM
+    first, second = ORM(), ORM()
+    key = ORM._cache_key('find', {'name': 'Ann'})
+    first._cache_set('users', key, [{'name': 'Ann'}])
+
+    assert second._cache_get('users', key) is None
+
+    rows = first._cache_get('users', key)
+    rows[0]['name'] = 'Changed'
+    assert first._cache_get('users', key) == [{'name': 'Ann'}]
+
+    first._invalidate('users')
+    assert first._cache_get('users', key) is None
+
+def test_orm_approximate_counts_are_per_owner():
+    """An approximate count kept for one backend's table is not served for another's."""
+    from odbms.orms.base import ORM
+
+    class FirstBackend(ORM):
+        pass
+
+    class SecondBackend(ORM):
+        pass
+
+    first, second = ORM(), ORM()
+    first._approx_count_set('users', 10)
+    FirstBackend._approx_count_set('users', 20)
+
+    assert first._approx_count_get('users') == 10
+    assert second._approx_count_get('users') is None
+    assert FirstBackend._approx_count_get('users') == 20
+    assert SecondBackend._approx_count_get('users') is None
+
+def test_sqlite_memory_reads_wait_for_open_write():
+    """In-memory reads share the write connection, so they wait for a write instead of failing."""
+    import threading
+    from odbms.orms.sqlitedb import SQLiteDB
+    db = SQLiteDB(database=':memory:')
+    db.connect()
+    try:
+        db.executescript("CREATE TABLE IF NOT EXISTS pending_rows (id INTEGER PRIMARY KEY, name TEXT)")
+        results = []
+        reader = threading.Thread(target=lambda: results.append(db.find('pending_rows')))
+        with db._writer('pending_rows') as conn:
+            conn.execute("INSERT INTO pending_rows (name) VALUES ('queued')")
+            reader.start()
+            reader.join(0.1)
+            assert reader.is_alive()
+        reader.join(1)
+        assert [row['name'] for row in results[0]] == ['queued']
+    finally:
+        db.executescript("DROP TABLE IF EXISTS pending_rows")
+        db.disconnect()
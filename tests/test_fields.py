@@ -1,55 +1,45 @@
 import pytest
+from contextlib import nullcontext
 from decimal import Decimal
 from odbms.fields import FloatField
 
-def test_float_field_validation():
+@pytest.mark.parametrize("field_kwargs,value,should_raise", [
+    # Basic float field
+    ({}, 3.14, False),
+    ({}, "3.14", False),
+    ({}, 42, False),
+    ({}, None, False),  # Should allow None by default
+    # Required field
+    ({'required': True}, None, True),
+    # Min value
+    ({'min_value': 0.0}, 0.0, False),
+    ({'min_value': 0.0}, 1.5, False),
+    ({'min_value': 0.0}, -1.5, True),
+    # Max value
+    ({'max_value': 10.0}, 10.0, False),
+    ({'max_value': 10.0}, 5.5, False),
+    ({'max_value': 10.0}, 11.0, True),
+    # Range
+    ({'min_value': -1.0, 'max_value': 1.0}, -1.0, False),
+    ({'min_value': -1.0, 'max_value': 1.0}, 0.0, False),
+    ({'min_value': -1.0, 'max_value': 1.0}, 1.0, False),
+    ({'min_value': -1.0, 'max_value': 1.0}, -1.5, True),
+    ({'min_value': -1.0, 'max_value': 1.0}, 1.5, True),
+    # Invalid values
+    ({}, "not a number", True),
+    ({}, [1, 2, 3], True),
+])
+def test_float_field_validation(field_kwargs, value, should_raise):
     """Test FloatField validation."""
-    # Test basic float field
-    field = FloatField()
-    field.validate(3.14)
-    field.validate("3.14")
-    field.validate(42)
-    field.validate(None)  # Should allow None by default
-    
-    # Test required field
-    required_field = FloatField(required=True)
-    with pytest.raises(ValueError):
-        required_field.validate(None)
-    
-    # Test min value
-    min_field = FloatField(min_value=0.0)
-    min_field.validate(0.0)
-    min_field.validate(1.5)
-    with pytest.raises(ValueError):
-        min_field.validate(-1.5)
-    
-    # Test max value
-    max_field = FloatField(max_value=10.0)
-    max_field.validate(10.0)
-    max_field.validate(5.5)
-    with pytest.raises(ValueError):
-        max_field.validate(11.0)
-    
-    # Test range
-    range_field = FloatField(min_value=-1.0, max_value=1.0)
-    range_field.validate(-1.0)
-    range_field.validate(0.0)
-    range_field.validate(1.0)
-    with pytest.raises(ValueError):
-        range_field.validate(-1.5)
-    with pytest.raises(ValueError):
-        range_field.validate(1.5)
-    
-    # Test precision
+    field = FloatField(**field_kwargs)
+    with pytest.raises(ValueError) if should_raise else nullcontext():
+        field.validate(value)
+
+@pytest.mark.parametrize("value", [3.14159, "3.14159"])
+def test_float_field_precision(value):
+    """Test FloatField precision rounding."""
     precision_field = FloatField(precision=2)
-    assert precision_field.to_python(3.14159) == 3.14
-    assert precision_field.to_python("3.14159") == 3.14
-    
-    # Test invalid values
-    with pytest.raises(ValueError):
-        field.validate("not a number")
-    with pytest.raises(ValueError):
-        field.validate([1, 2, 3])
+    assert precision_field.to_python(value) == 3.14
 
 def test_float_field_conversion():
     """Test FloatField value conversion."""
@@ -1,10 +1,14 @@
+import asyncio
 import pytest
+import re
 from datetime import datetime
 from typing import Optional, List, Union
 
 from odbms.dbms import DBMS
 from odbms.model import Model
-from pydantic import Field
+from pydantic import Field, field_validator
+
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
 class Address(Model):
     street: str = Field(default=...)
@@ -19,11 +23,18 @@ class Post(Model):
 
 class User(Model):
     name: str = Field(default=...)
-    email: str = Field(default=..., pattern=r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    email: str = Field(default=...)
     age: Optional[int] = Field(default=None, ge=0)
     address_id: Optional[Union[str, int]] = Field(default=None)
     posts_ids: List[Union[str, int]] = Field(default_factory=list)
     
+    @field_validator('email')
+    @classmethod
+    def _check_email(cls, value: str) -> str:
+        if not EMAIL_RE.match(value):
+            raise ValueError('Invalid email address')
+        return value
+    
     def __init__(self, **data):
         super().__init__(**data)
         self._address: Optional[Address] = None
@@ -46,8 +57,7 @@ class User(Model):
     @property
     def posts(self) -> List[Post]:
         if not self._posts and self.posts_ids:
-            posts = [Post.get(post_id) for post_id in self.posts_ids]
-            self._posts = [post for post in posts if post is not None]
+            self._posts = Post.get_many(self.posts_ids)
         return self._posts
     
     @posts.setter
@@ -55,105 +65,12 @@ class User(Model):
         self._posts = value
         setattr(self, 'posts_ids', [post.id for post in value if post is not None])
 
-@pytest.fixture(scope="module")
-def database():
-    """Initialize database for testing."""
-    DBMS.initialize(
-        dbms='sqlite',
-        database=':memory:'
-    )
-    
-    # Create tables
-    if DBMS.Database is not None and DBMS.Database.dbms != 'mongodb':
-        # Create addresses table first
-        DBMS.Database.execute("""
-            CREATE TABLE IF NOT EXISTS addresses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                street TEXT NOT NULL,
-                city TEXT NOT NULL,
-                country TEXT NOT NULL,
-                postal_code TEXT,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP
-            )
-        """)
-        
-        # Create users table second (since posts will reference it)
-        DBMS.Database.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                age INTEGER,
-                address_id INTEGER,
-                posts_ids TEXT,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP,
-                FOREIGN KEY (address_id) REFERENCES addresses (id)
-            )
-        """)
-        
-        # Create posts table last
-        DBMS.Database.execute("""
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                published BOOLEAN DEFAULT 0,
-                user_id INTEGER,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        """)
-    
-    yield DBMS.Database
-    
-    # Cleanup
-    if DBMS.Database is not None:
-        if DBMS.Database.dbms != 'mongodb':
-            DBMS.Database.execute("DROP TABLE IF EXISTS posts")
-            DBMS.Database.execute("DROP TABLE IF EXISTS users")
-            DBMS.Database.execute("DROP TABLE IF EXISTS addresses")
-        DBMS.Database.disconnect()
-
-@pytest.fixture
-def test_data():
-    """Test data fixture."""
-    return {
-        'address_data': {
-            'street': '123 Main St',
-            'city': 'Test City',
-            'country': 'Test Country',
-            'postal_code': '12345'
-        },
-        'user_data': {
-            'name': 'John Doe',
-            'email': 'john@example.com',
-            'age': 30
-        },
-        'post_data': {
-            'title': 'Test Post',
-            'content': 'Test Content',
-            'published': True
-        }
-    }
-
-@pytest.fixture(autouse=True)
-def cleanup(database):
-    """Clean up after each test."""
-    yield
-    if DBMS.Database is not None:
-        if DBMS.Database.dbms != 'mongodb':
-            DBMS.Database.execute("DELETE FROM addresses")
-            DBMS.Database.execute("DELETE FROM posts")
-            DBMS.Database.execute("DELETE FROM users")
-        else:
-            DBMS.Database.remove('addresses', {})
-            DBMS.Database.remove('posts', {})
-            DBMS.Database.remove('users', {})
+@pytest.fixture(scope="session")
+def sample_user(test_data):
+    """Validated user for tests that only read it; never save or modify it."""
+    return User(**test_data['user_data'])
 
-def test_field_validation(test_data):
+def test_field_validation(sample_user):
     """Test field validation."""
     # Test required field
     with pytest.raises(ValueError):
@@ -168,10 +85,9 @@ def test_field_validation(test_data):
         User(name='Test', email='test@example.com', age=-1)
     
     # Test valid data
-    user = User(**test_data['user_data'])
-    assert user.name == 'John Doe'
-    assert user.email == 'john@example.com'
-    assert user.age == 30
+    assert sample_user.name == 'John Doe'
+    assert sample_user.email == 'john@example.com'
+    assert sample_user.age == 30
 
 def test_relationships(test_data):
     """Test model relationships."""
@@ -264,9 +180,8 @@ async def test_async_relationships(test_data):
     
     # Create posts
     post1 = Post(**test_data['post_data'])
-    await post1.save_async()
     post2 = Post(title='Another Post', content='More Content', published=False)
-    await post2.save_async()
+    await asyncio.gather(post1.save_async(), post2.save_async())
     
     # Add posts to user
     user.posts = [post1, post2]
@@ -289,63 +204,70 @@ async def test_async_relationships(test_data):
     await user.delete_async(cascade=True)
     
     # Verify everything was deleted
-    assert await User.get_async(user.id) is None
-    assert await Address.get_async(address.id) is None
-    assert await Post.get_async(post1.id) is None
-    assert await Post.get_async(post2.id) is None 
+    remaining = await asyncio.gather(
+        User.get_async(user.id),
+        Address.get_async(address.id),
+        Post.get_async(post1.id),
+        Post.get_async(post2.id)
+    )
+    assert remaining == [None, None, None, None]
 
-def test_find_and_all(test_data):
-    """Test find and all methods."""
-    # Create multiple users
-    users = [
+FIND_CASES = [
+    pytest.param({'age': 30}, {'John Doe'}, id='equal'),
+    pytest.param({'age': {'$gte': 30}}, {'John Doe', 'Bob Smith'}, id='$gte'),
+    pytest.param(None, {'John Doe', 'Jane Doe', 'Bob Smith'}, id='all'),
+]
+
+@pytest.fixture
+def seeded_users(database):
+    """Insert the users queried by the find/all tests in one batch."""
+    User.bulk_save([
         User(name='John Doe', email='john@example.com', age=30),
         User(name='Jane Doe', email='jane@example.com', age=25),
         User(name='Bob Smith', email='bob@example.com', age=35)
+    ])
+
+@pytest.mark.parametrize("query,expected_names", FIND_CASES)
+def test_find_and_all(seeded_users, query, expected_names):
+    """Test find and all methods; a None query means all()."""
+    found_users = User.all() if query is None else User.find(query)
+    assert len(found_users) == len(expected_names)
+    assert {user.name for user in found_users} == expected_names
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query,expected_names", FIND_CASES)
+async def test_find_async_and_all_async(seeded_users, query, expected_names):
+    """Test find_async and all_async methods; a None query means all_async()."""
+    found_users = await (User.all_async() if query is None else User.find_async(query))
+    assert len(found_users) == len(expected_names)
+    assert {user.name for user in found_users} == expected_names
+
+def test_bulk_save_inserts_rows(database):
+    """bulk_save writes every instance with one shared updated_at timestamp."""
+    posts = [
+        Post(title='First Post', content='One', published=True),
+        Post(title='Second Post', content='Two')
     ]
-    for user in users:
-        user.save()
+    assert Post.bulk_save(posts) == 2
     
-    # Test find with conditions
-    found_users = User.find({'age': 30})
-    assert len(found_users) == 1
-    assert found_users[0].name == 'John Doe'
-    
-    # Test find with multiple results
-    found_users = User.find({'age': {'$gte': 30}})
-    assert len(found_users) == 2
-    assert {user.name for user in found_users} == {'John Doe', 'Bob Smith'}
-    
-    # Test all method
-    all_users = User.all()
-    assert len(all_users) == 3
-    assert {user.name for user in all_users} == {'John Doe', 'Jane Doe', 'Bob Smith'}
+    stored = sorted(Post.all(), key=lambda post: post.title)
+    assert [(post.title, post.content, post.published) for post in stored] == [
+        ('First Post', 'One', True),
+        ('Second Post', 'Two', False)
+    ]
+    assert stored[0].updated_at == stored[1].updated_at
 
 @pytest.mark.asyncio
-async def test_find_async_and_all_async(test_data):
-    """Test find_async and all_async methods."""
-    # Create multiple users
-    users = [
-        User(name='John Doe', email='john@example.com', age=30),
-        User(name='Jane Doe', email='jane@example.com', age=25),
-        User(name='Bob Smith', email='bob@example.com', age=35)
+async def test_bulk_save_async_inserts_rows(database):
+    """bulk_save_async writes every instance in one insert_many_async call."""
+    posts = [
+        Post(title='First Post', content='One', published=True),
+        Post(title='Second Post', content='Two')
     ]
-    for user in users:
-        await user.save_async()
-    
-    # Test find_async with conditions
-    found_users = await User.find_async({'age': 30})
-    assert len(found_users) == 1
-    assert found_users[0].name == 'John Doe'
-    
-    # Test find_async with multiple results
-    found_users = await User.find_async({'age': {'$gte': 30}})
-    assert len(found_users) == 2
-    assert {user.name for user in found_users} == {'John Doe', 'Bob Smith'}
+    assert await Post.bulk_save_async(posts) == 2
     
-    # Test all_async method
-    all_users = await User.all_async()
-    assert len(all_users) == 3
-    assert {user.name for user in all_users} == {'John Doe', 'Jane Doe', 'Bob Smith'} 
+    stored = await Post.all_async()
+    assert {post.title for post in stored} == {'First Post', 'Second Post'}
 
 def test_update_and_remove_class_methods(test_data):
     """Test update and remove class methods."""
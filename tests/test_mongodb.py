@@ -1,10 +1,9 @@
 import pytest
 from odbms.orms.mongodb import MongoDB
-import asyncio
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def db():
-    """Database fixture."""
+    """Database fixture shared by the whole session."""
     settings = {
         'host': 'localhost',
         'port': 27017,
@@ -14,17 +13,13 @@ def db():
     db_instance.connect()
     yield db_instance
     db_instance.disconnect()
+    MongoDB.close_all()
 
 @pytest.fixture(autouse=True)
-async def cleanup(db):
+def cleanup(db):
     """Clean up after each test."""
     yield
-    # Create new event loop if needed
-    if db._loop is None or db._loop.is_closed():
-        db._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(db._loop)
-    await db.remove_async('test_users', {})
-    await db.remove_async('test_scores', {})
+    db.bulk_clear(['test_users', 'test_scores'])
 
 def test_crud_operations(db):
     """Test basic CRUD operations."""
@@ -56,106 +51,48 @@ def test_crud_operations(db):
     user = db.find_one('test_users', {'_id': user_id})
     assert user is None
 
-def test_query_operators(db):
+USERS = [
+    {'name': 'John', 'age': 20},
+    {'name': 'Jane', 'age': 25},
+    {'name': 'Bob', 'age': 30},
+    {'name': 'Alice', 'age': 35},
+]
+
+SCORES = [
+    {'user_id': 1, 'score': 10},
+    {'user_id': 1, 'score': 20},
+    {'user_id': 2, 'score': 30},
+]
+
+QUERY_OPERATOR_CASES = [
+    pytest.param({'age': {'$lt': 25}}, {'John'}, id='$lt'),
+    pytest.param({'age': {'$lte': 25}}, {'John', 'Jane'}, id='$lte'),
+    pytest.param({'age': {'$gt': 30}}, {'Alice'}, id='$gt'),
+    pytest.param({'age': {'$gte': 30}}, {'Bob', 'Alice'}, id='$gte'),
+    pytest.param({'name': {'$ne': 'John'}}, {'Jane', 'Bob', 'Alice'}, id='$ne'),
+    pytest.param({'name': {'$in': ['John', 'Jane']}}, {'John', 'Jane'}, id='$in'),
+    pytest.param({'name': {'$nin': ['John', 'Jane']}}, {'Bob', 'Alice'}, id='$nin'),
+]
+
+@pytest.fixture
+def users(db):
+    """Insert the query-operator test users."""
+    db.insert_many('test_users', [dict(user) for user in USERS])
+
+@pytest.mark.parametrize("query,expected_names", QUERY_OPERATOR_CASES)
+def test_query_operators(db, users, query, expected_names):
     """Test MongoDB query operators."""
-    # Insert test data
-    users = [
-        {'name': 'John', 'age': 20},
-        {'name': 'Jane', 'age': 25},
-        {'name': 'Bob', 'age': 30},
-        {'name': 'Alice', 'age': 35},
-    ]
-    for user in users:
-        db.insert('test_users', user)
-
-    # Test $lt (less than)
-    young_users = db.find('test_users', {'age': {'$lt': 25}})
-    assert len(young_users) == 1
-    assert young_users[0]['name'] == 'John'
-
-    # Test $lte (less than or equal)
-    young_users = db.find('test_users', {'age': {'$lte': 25}})
-    assert len(young_users) == 2
-    assert {user['name'] for user in young_users} == {'John', 'Jane'}
-
-    # Test $gt (greater than)
-    older_users = db.find('test_users', {'age': {'$gt': 30}})
-    assert len(older_users) == 1
-    assert older_users[0]['name'] == 'Alice'
-
-    # Test $gte (greater than or equal)
-    older_users = db.find('test_users', {'age': {'$gte': 30}})
-    assert len(older_users) == 2
-    assert {user['name'] for user in older_users} == {'Bob', 'Alice'}
-
-    # Test $ne (not equal)
-    not_john = db.find('test_users', {'name': {'$ne': 'John'}})
-    assert len(not_john) == 3
-    assert all(user['name'] != 'John' for user in not_john)
-
-    # Test $in (in array)
-    selected_users = db.find('test_users', {'name': {'$in': ['John', 'Jane']}})
-    assert len(selected_users) == 2
-    assert {user['name'] for user in selected_users} == {'John', 'Jane'}
-
-    # Test $nin (not in array)
-    other_users = db.find('test_users', {'name': {'$nin': ['John', 'Jane']}})
-    assert len(other_users) == 2
-    assert {user['name'] for user in other_users} == {'Bob', 'Alice'}
-
-    # Clean up
-    db.remove('test_users', {})
+    found = db.find('test_users', query)
+    assert len(found) == len(expected_names)
+    assert {user['name'] for user in found} == expected_names
 
 @pytest.mark.asyncio
-async def test_async_query_operators(db):
+@pytest.mark.parametrize("query,expected_names", QUERY_OPERATOR_CASES)
+async def test_async_query_operators(db, users, query, expected_names):
     """Test MongoDB query operators with async operations."""
-    # Insert test data
-    users = [
-        {'name': 'John', 'age': 20},
-        {'name': 'Jane', 'age': 25},
-        {'name': 'Bob', 'age': 30},
-        {'name': 'Alice', 'age': 35},
-    ]
-    for user in users:
-        await db.insert_async('test_users', user)
-
-    # Test $lt (less than)
-    young_users = await db.find_async('test_users', {'age': {'$lt': 25}})
-    assert len(young_users) == 1
-    assert young_users[0]['name'] == 'John'
-
-    # Test $lte (less than or equal)
-    young_users = await db.find_async('test_users', {'age': {'$lte': 25}})
-    assert len(young_users) == 2
-    assert {user['name'] for user in young_users} == {'John', 'Jane'}
-
-    # Test $gt (greater than)
-    older_users = await db.find_async('test_users', {'age': {'$gt': 30}})
-    assert len(older_users) == 1
-    assert older_users[0]['name'] == 'Alice'
-
-    # Test $gte (greater than or equal)
-    older_users = await db.find_async('test_users', {'age': {'$gte': 30}})
-    assert len(older_users) == 2
-    assert {user['name'] for user in older_users} == {'Bob', 'Alice'}
-
-    # Test $ne (not equal)
-    not_john = await db.find_async('test_users', {'name': {'$ne': 'John'}})
-    assert len(not_john) == 3
-    assert all(user['name'] != 'John' for user in not_john)
-
-    # Test $in (in array)
-    selected_users = await db.find_async('test_users', {'name': {'$in': ['John', 'Jane']}})
-    assert len(selected_users) == 2
-    assert {user['name'] for user in selected_users} == {'John', 'Jane'}
-
-    # Test $nin (not in array)
-    other_users = await db.find_async('test_users', {'name': {'$nin': ['John', 'Jane']}})
-    assert len(other_users) == 2
-    assert {user['name'] for user in other_users} == {'Bob', 'Alice'}
-
-    # Clean up
-    await db.remove_async('test_users', {})
+    found = await db.find_async('test_users', query)
+    assert len(found) == len(expected_names)
+    assert {user['name'] for user in found} == expected_names
 
 @pytest.mark.asyncio
 async def test_async_crud_operations(db):
@@ -191,28 +128,39 @@ async def test_async_crud_operations(db):
 def test_sum_operation(db):
     """Test sum operation."""
     # Insert test data
-    db.insert('test_scores', {'user_id': 1, 'score': 10})
-    db.insert('test_scores', {'user_id': 1, 'score': 20})
-    db.insert('test_scores', {'user_id': 2, 'score': 30})
+    db.insert_many('test_scores', [dict(score) for score in SCORES])
     
     # Test sum
     total = db.sum('test_scores', 'score', {'user_id': 1})
     assert total == 30
 
-    # Clean up
-    db.remove('test_scores', {})
-
 @pytest.mark.asyncio
 async def test_sum_async_operation(db):
     """Test async sum operation."""
     # Insert test data
-    await db.insert_async('test_scores', {'user_id': 1, 'score': 10})
-    await db.insert_async('test_scores', {'user_id': 1, 'score': 20})
-    await db.insert_async('test_scores', {'user_id': 2, 'score': 30})
+    await db.insert_many_async('test_scores', [dict(score) for score in SCORES])
     
     # Test sum_async
     total = await db.sum_async('test_scores', 'score', {'user_id': 1})
     assert total == 30
-
-    # Clean up
-    await db.remove_async('test_scores', {}) 
\ No newline at end of file
+def test_count_operation(db):
+    """count() is exact by default; approximate=True opts into the metadata estimate."""
+    db.insert_many('test_scores', [dict(score) for score in SCORES])
+    
+    assert db.count('test_scores') == len(SCORES)
+    assert db.count('test_scores', {'user_id': 1}) == 2
+    assert db.count('test_scores', approximate=True) >= 0
+
+def test_clients_are_shared_only_for_identical_settings():
+    """Connections differing in any client option get their own MongoClient."""
+    settings = {'host': 'localhost', 'port': 27017, 'database': 'test_db', 'username': 'app', 'password': 'one'}
+    first, same = MongoDB(**settings), MongoDB(**settings)
+    other_password = MongoDB(**{**settings, 'password': 'two'})
+    other_auth_source = MongoDB(**{**settings, 'authSource': 'admin'})
+    for instance in (first, same, other_password, other_auth_source):
+        instance.connect()
+
+    assert same.client is first.client
+    assert other_password.client is not first.client
+    assert other_auth_source.client is not first.client
+    assert other_auth_source.client is not other_password.client
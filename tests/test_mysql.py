@@ -1,31 +1,53 @@
 import pytest
 from odbms.orms.mysqldb import MysqlDB
 
+SETTINGS = {
+    'host': 'localhost',
+    'port': 3306,
+    'user': 'root',
+    'password': 'root',
+    'database': 'test_db',
+    'multi_statements': True
+}
+
+SCHEMA = [
+    ("""
+        CREATE TABLE IF NOT EXISTS test_users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100),
+            age INTEGER
+        )
+    """, ()),
+    ("""
+        CREATE TABLE IF NOT EXISTS test_scores (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INTEGER,
+            score INTEGER
+        )
+    """, ()),
+]
+
+@pytest.fixture(scope="session")
+def schema():
+    """Create the test tables once per session."""
+    MysqlDB.connect(SETTINGS)
+    MysqlDB.execute_pipeline(SCHEMA)
+    MysqlDB.disconnect()
+    yield
+    MysqlDB.connect(SETTINGS)
+    MysqlDB.execute_pipeline([("DROP TABLE IF EXISTS test_users", ()), ("DROP TABLE IF EXISTS test_scores", ())])
+    MysqlDB.disconnect()
+
 @pytest.fixture
-def db():
-    """Database fixture."""
-    settings = {
-        'host': 'localhost',
-        'port': 3306,
-        'user': 'root',
-        'password': 'root',
-        'database': 'test_db'
-    }
-    MysqlDB.connect(settings)
+def db(schema):
+    """Database fixture; empties the test tables after each test."""
+    MysqlDB.connect(SETTINGS)
     yield MysqlDB
+    MysqlDB.execute_pipeline([("TRUNCATE TABLE test_users", ()), ("TRUNCATE TABLE test_scores", ())])
     MysqlDB.disconnect()
 
 def test_crud_operations(db):
     """Test basic CRUD operations."""
-    # Create test table
-    db._run_sync(db._pool.acquire().__aenter__().cursor().__aenter__().execute("""
-        CREATE TABLE IF NOT EXISTS test_users (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(100),
-            age INTEGER
-        )
-    """))
-    
     # Test insert
     data = {'name': 'John Doe', 'age': 30}
     user_id = db.insert('test_users', data)
@@ -54,23 +76,9 @@ def test_crud_operations(db):
     user = db.find_one('test_users', {'id': user_id})
     assert user is None
 
-    # Clean up
-    db._run_sync(db._pool.acquire().__aenter__().cursor().__aenter__().execute("DROP TABLE test_users"))
-
 @pytest.mark.asyncio
 async def test_async_crud_operations(db):
     """Test async CRUD operations."""
-    # Create test table
-    async with db._pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("""
-                CREATE TABLE IF NOT EXISTS test_users (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(100),
-                    age INTEGER
-                )
-            """)
-    
     # Test insert_async
     data = {'name': 'Jane Doe', 'age': 25}
     user_id = await db.insert_async('test_users', data)
@@ -99,60 +107,29 @@ async def test_async_crud_operations(db):
     user = await db.find_one_async('test_users', {'id': user_id})
     assert user is None
 
-    # Clean up
-    async with db._pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("DROP TABLE test_users")
-
 def test_sum_operation(db):
     """Test sum operation."""
-    # Create test table
-    db._run_sync(db._pool.acquire().__aenter__().cursor().__aenter__().execute("""
-        CREATE TABLE IF NOT EXISTS test_scores (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            user_id INTEGER,
-            score INTEGER
-        )
-    """))
-    
     # Insert test data
-    db._run_sync(db._pool.acquire().__aenter__().cursor().__aenter__().execute("""
-        INSERT INTO test_scores (user_id, score)
-        VALUES (1, 10), (1, 20), (2, 30)
-    """))
-    
+    db.insert_many('test_scores', [
+        {'user_id': 1, 'score': 10},
+        {'user_id': 1, 'score': 20},
+        {'user_id': 2, 'score': 30}
+    ])
+
     # Test sum
     total = db.sum('test_scores', 'score', {'user_id': 1})
     assert total == 30
 
-    # Clean up
-    db._run_sync(db._pool.acquire().__aenter__().cursor().__aenter__().execute("DROP TABLE test_scores"))
-
 @pytest.mark.asyncio
 async def test_sum_async_operation(db):
     """Test async sum operation."""
-    # Create test table
-    async with db._pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("""
-                CREATE TABLE IF NOT EXISTS test_scores (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INTEGER,
-                    score INTEGER
-                )
-            """)
-            
-            # Insert test data
-            await cur.execute("""
-                INSERT INTO test_scores (user_id, score)
-                VALUES (1, 10), (1, 20), (2, 30)
-            """)
-    
+    # Insert test data
+    await db.insert_many_async('test_scores', [
+        {'user_id': 1, 'score': 10},
+        {'user_id': 1, 'score': 20},
+        {'user_id': 2, 'score': 30}
+    ])
+
     # Test sum_async
     total = await db.sum_async('test_scores', 'score', {'user_id': 1})
     assert total == 30
-
-    # Clean up
-    async with db._pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("DROP TABLE test_scores") 
\ No newline at end of file
@@ -2,145 +2,300 @@ import pytest
 from odbms.orms.mysqldb import MysqlDB
 import asyncio
 
-@pytest.fixture
-async def db():
-    """Database fixture."""
-    settings = {
-        'host': 'localhost',
-        'port': 3306,
-        'database': 'test_db',
-        'user': 'root',
-        'password': 'root'
-    }
-    MysqlDB.connect(dbsettings=settings)
-    
-    # Wait for pool to be ready
-    while MysqlDB._pool is None:
-        await asyncio.sleep(0.01)
+SETTINGS = {
+    'host': 'localhost',
+    'port': 3306,
+    'database': 'test_db',
+    'user': 'root',
+    'password': 'root',
+    'multi_statements': True
+}
+
+SCHEMA = [
+    ("""
+        CREATE TABLE IF NOT EXISTS test_users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100),
+            age INTEGER,
+            INDEX idx_age (age)
+        )
+    """, ()),
+    ("""
+        CREATE TABLE IF NOT EXISTS test_scores (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INTEGER,
+            score INTEGER,
+            INDEX idx_user_id (user_id)
+        )
+    """, ()),
+]
+
+async def _server_reachable(host: str, port: int, timeout: float = 0.2) -> bool:
+    """Probe the MySQL port so a missing server skips quickly instead of timing out."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+@pytest.fixture(scope="session")
+async def mysql_pool():
+    """Connect and create the test tables once per session."""
+    if not await _server_reachable(SETTINGS['host'], SETTINGS['port']):
+        pytest.skip("MySQL server unavailable")
+    # The pool is created on the test loop and ready once this returns
+    await MysqlDB.connect_async(dbsettings=SETTINGS)
     
-    # Create test tables
-    async with MysqlDB._pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("""
-                CREATE TABLE IF NOT EXISTS test_users (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(100),
-                    age INTEGER
-                )
-            """)
-            await cur.execute("""
-                CREATE TABLE IF NOT EXISTS test_scores (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INTEGER,
-                    score INTEGER
-                )
-            """)
-            await conn.commit()
+    # Both CREATE TABLEs go out in one multi-statement round trip
+    await MysqlDB.execute_pipeline_async(SCHEMA)
     
     yield MysqlDB
     
-    # Drop test tables
-    async with MysqlDB._pool.acquire() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute("DROP TABLE IF EXISTS test_scores")
-            await cur.execute("DROP TABLE IF EXISTS test_users")
-            await conn.commit()
+    await MysqlDB.execute_pipeline_async([
+        ("DROP TABLE IF EXISTS test_scores", ()),
+        ("DROP TABLE IF EXISTS test_users", ()),
+    ])
+    
+    await MysqlDB.disconnect_async()
+
+@pytest.fixture
+async def db(mysql_pool):
+    """Database fixture; empties the test tables after each test."""
+    yield mysql_pool
     
-    MysqlDB.disconnect()
+    await mysql_pool.execute_pipeline_async([
+        ("TRUNCATE TABLE test_users", ()),
+        ("TRUNCATE TABLE test_scores", ()),
+    ])
+
+@pytest.fixture
+async def tx(mysql_pool):
+    """Pin one pooled connection to the test and roll back its transaction afterwards."""
+    async with mysql_pool.pinned() as conn:
+        await conn.begin()
+        try:
+            yield conn
+        finally:
+            await conn.rollback()
 
 @pytest.mark.asyncio
 async def test_crud_operations(db):
     """Test basic CRUD operations."""
-    # Test insert
+    # Test insert, reading the stored row back in the same call
     data = {'name': 'John Doe', 'age': 30}
-    user_id = await db.insert_async('test_users', data)
-    assert user_id is not None
-
-    # Test find_one
-    user = await db.find_one_async('test_users', {'id': user_id})
+    user = await db.insert_async('test_users', data, returning=True)
     assert user is not None
     assert user['name'] == 'John Doe'
     assert user['age'] == 30
+    user_id = user['id']
 
-    # Test find
-    users = await db.find_async('test_users', {'age': 30})
+    # Test find_one and find; the reads are independent, so they run concurrently
+    # on separate pooled connections (not pinned, unlike the tx fixture)
+    user, users = await asyncio.gather(
+        db.find_one_async('test_users', {'id': user_id}, columns=['name', 'age']),
+        db.find_async('test_users', {'age': 30}, columns=['name', 'age'])
+    )
+    assert user['name'] == 'John Doe'
     assert len(users) == 1
     assert users[0]['name'] == 'John Doe'
 
     # Test update
     updated = await db.update_async('test_users', {'id': user_id}, {'age': 31})
     assert updated == 1
-    user = await db.find_one_async('test_users', {'id': user_id})
+    user = await db.find_one_async('test_users', {'id': user_id}, columns=['age'])
     assert user['age'] == 31
 
     # Test remove
     removed = await db.remove_async('test_users', {'id': user_id})
     assert removed == 1
-    user = await db.find_one_async('test_users', {'id': user_id})
-    assert user is None
+    assert not await db.exists_async('test_users', {'id': user_id})
+
+USERS = [
+    {'name': 'John', 'age': 20},
+    {'name': 'Jane', 'age': 25},
+    {'name': 'Bob', 'age': 30},
+    {'name': 'Alice', 'age': 35},
+]
+
+QUERY_OPERATOR_CASES = [
+    pytest.param({'age': {'$lt': 25}}, {'John'}, id='$lt'),
+    pytest.param({'age': {'$lte': 25}}, {'John', 'Jane'}, id='$lte'),
+    pytest.param({'age': {'$gt': 30}}, {'Alice'}, id='$gt'),
+    pytest.param({'age': {'$gte': 30}}, {'Bob', 'Alice'}, id='$gte'),
+    pytest.param({'name': {'$ne': 'John'}}, {'Jane', 'Bob', 'Alice'}, id='$ne'),
+    pytest.param({'name': {'$in': ['John', 'Jane']}}, {'John', 'Jane'}, id='$in'),
+    pytest.param({'name': {'$nin': ['John', 'Jane']}}, {'Bob', 'Alice'}, id='$nin'),
+]
+
+@pytest.fixture
+async def users(mysql_pool, tx):
+    """Insert the query-operator test users inside the test transaction."""
+    await mysql_pool.insert_many_async('test_users', USERS)
 
 @pytest.mark.asyncio
-async def test_query_operators(db):
+@pytest.mark.parametrize("query,expected_names", QUERY_OPERATOR_CASES)
+async def test_query_operators(mysql_pool, tx, users, query, expected_names):
     """Test MongoDB-style query operators."""
-    # Insert test data
-    users = [
+    assert await mysql_pool.count_async('test_users', query) == len(expected_names)
+    assert await mysql_pool.exists_async('test_users', query)
+
+    # LIMIT lets the server stop once the expected rows are found
+    found = await mysql_pool.find_async('test_users', query, columns=['name'], limit=len(expected_names))
+    assert {user['name'] for user in found} == expected_names
+
+@pytest.fixture
+def executed(monkeypatch):
+    """Record the SQL text of every statement MysqlDB executes."""
+    queries = []
+    execute = MysqlDB._execute.__func__
+
+    async def recording_execute(cls, conn, cur, query, params):
+        queries.append(query)
+        await execute(cls, conn, cur, query, params)
+
+    monkeypatch.setattr(MysqlDB, '_execute', classmethod(recording_execute))
+    return queries
+
+def test_filter_pushdown_sql():
+    """Query operators are translated to parameterized SQL conditions."""
+    shape, params = MysqlDB._filter_shape({
+        'name': {'$in': ['John', 'Jane']},
+        'age': {'$gte': 20, '$lt': 30},
+    })
+    assert MysqlDB._where_sql(shape) == ' WHERE age >= %s AND age < %s AND name IN (%s, %s)'
+    assert params == (20, 30, 'John', 'Jane')
+
+    shape, params = MysqlDB._filter_shape({'name': {'$nin': ['John']}, 'id': {'$ne': 1}})
+    assert MysqlDB._where_sql(shape) == ' WHERE id <> %s AND name NOT IN (%s)'
+    assert params == (1, 'John')
+
+    # List lengths are bucketed to powers of two by repeating the last item
+    shape, params = MysqlDB._filter_shape({'id': {'$in': [1, 2, 3]}})
+    assert MysqlDB._where_sql(shape) == ' WHERE id IN (%s, %s, %s, %s)'
+    assert params == (1, 2, 3, 3)
+    assert MysqlDB._filter_shape({'id': {'$in': [4, 5, 6, 7]}})[0] == shape
+
+    shape, params = MysqlDB._filter_shape({'name': {'$in': []}})
+    assert MysqlDB._where_sql(shape) == ' WHERE 1 = 0'
+    assert params == ()
+
+    with pytest.raises(ValueError):
+        MysqlDB._filter_shape({'name': {'$regex': 'J.*'}})
+
+@pytest.mark.asyncio
+async def test_pinned_connection_is_reused():
+    """Calls inside pinned() run on the pinned connection."""
+    conn = object()
+    async with MysqlDB.pinned(conn):
+        async with MysqlDB._connection() as used:
+            assert used is conn
+
+class _DetachedMysqlDB(MysqlDB):
+    """MysqlDB with its own unset pool state, so tests can detach it safely."""
+    _pool = None
+    _pool_ready = None
+    _write_queue = None
+    _writer_task = None
+
+@pytest.mark.asyncio
+async def test_detach_fails_queued_batched_inserts():
+    """Disconnecting fails inserts still in the batch queue instead of leaving them waiting."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _DetachedMysqlDB._write_queue = asyncio.Queue()
+    _DetachedMysqlDB._write_queue.put_nowait(('test_users', {'name': 'John'}, future))
+    _DetachedMysqlDB._writer_task = loop.create_task(asyncio.sleep(3600))
+
+    _DetachedMysqlDB._detach_pool()
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(future, 1)
+    assert _DetachedMysqlDB._write_queue is None
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_writer_fails_in_flight_inserts():
+    """Inserts taken from the queue fail when the writer is cancelled mid-flush."""
+    class StalledMysqlDB(_DetachedMysqlDB):
+        @classmethod
+        async def _flush_batch(cls, table, columns, rows):
+            await asyncio.sleep(3600)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    future = loop.create_future()
+    queue.put_nowait(('test_users', {'name': 'John'}, future))
+    writer = loop.create_task(StalledMysqlDB._batch_writer(queue))
+    while not queue.empty():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(StalledMysqlDB.batch_max_wait * 2)
+
+    writer.cancel()
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(future, 1)
+    with pytest.raises(asyncio.CancelledError):
+        await writer
+
+@pytest.mark.asyncio
+async def test_in_operator_runs_on_server(db, executed):
+    """$in is sent to MySQL as IN (...) rather than filtered client-side."""
+    await db.insert_many_async('test_users', [
         {'name': 'John', 'age': 20},
         {'name': 'Jane', 'age': 25},
         {'name': 'Bob', 'age': 30},
-        {'name': 'Alice', 'age': 35},
-    ]
-    for user in users:
-        await db.insert_async('test_users', user)
-
-    # Test $lt (less than)
-    young_users = await db.find_async('test_users', {'age': {'$lt': 25}})
-    assert len(young_users) == 1
-    assert young_users[0]['name'] == 'John'
-
-    # Test $lte (less than or equal)
-    young_users = await db.find_async('test_users', {'age': {'$lte': 25}})
-    assert len(young_users) == 2
-    assert {user['name'] for user in young_users} == {'John', 'Jane'}
-
-    # Test $gt (greater than)
-    older_users = await db.find_async('test_users', {'age': {'$gt': 30}})
-    assert len(older_users) == 1
-    assert older_users[0]['name'] == 'Alice'
-
-    # Test $gte (greater than or equal)
-    older_users = await db.find_async('test_users', {'age': {'$gte': 30}})
-    assert len(older_users) == 2
-    assert {user['name'] for user in older_users} == {'Bob', 'Alice'}
-
-    # Test $ne (not equal)
-    not_john = await db.find_async('test_users', {'name': {'$ne': 'John'}})
-    assert len(not_john) == 3
-    assert all(user['name'] != 'John' for user in not_john)
-
-    # Test $in (in array)
-    selected_users = await db.find_async('test_users', {'name': {'$in': ['John', 'Jane']}})
-    assert len(selected_users) == 2
-    assert {user['name'] for user in selected_users} == {'John', 'Jane'}
-
-    # Test $nin (not in array)
-    other_users = await db.find_async('test_users', {'name': {'$nin': ['John', 'Jane']}})
-    assert len(other_users) == 2
-    assert {user['name'] for user in other_users} == {'Bob', 'Alice'}
-
-    # Clean up
-    await db.remove_async('test_users', {})
+    ])
+
+    found = await db.find_async('test_users', {'name': {'$in': ['John', 'Jane']}}, columns=['name'])
+
+    assert {user['name'] for user in found} == {'John', 'Jane'}
+    assert executed[-1].startswith('SELECT name FROM test_users')
+    assert 'name IN (%s, %s)' in executed[-1]
+
+@pytest.mark.asyncio
+async def test_stream_closed_early_frees_connection(mysql_pool, tx):
+    """Closing a stream after one row leaves the pinned connection usable."""
+    await mysql_pool.insert_many_async('test_users', USERS)
+
+    rows = mysql_pool.find_iter_async('test_users', columns=['name'])
+    try:
+        async for _ in rows:
+            break
+    finally:
+        await rows.aclose()
+
+    assert await mysql_pool.count_async('test_users') == len(USERS)
 
 @pytest.mark.asyncio
-async def test_sum_operation(db):
+async def test_sum_operation(mysql_pool, tx):
     """Test sum operation."""
     # Insert test data
-    await db.insert_async('test_scores', {'user_id': 1, 'score': 10})
-    await db.insert_async('test_scores', {'user_id': 1, 'score': 20})
-    await db.insert_async('test_scores', {'user_id': 2, 'score': 30})
+    await mysql_pool.insert_many_async('test_scores', [
+        {'user_id': 1, 'score': 10},
+        {'user_id': 1, 'score': 20},
+        {'user_id': 2, 'score': 30}
+    ])
     
     # Test sum
-    total = await db.sum_async('test_scores', 'score', {'user_id': 1})
+    total = await mysql_pool.sum_async('test_scores', 'score', {'user_id': 1})
     assert total == 30
 
-    # Clean up
-    await db.remove_async('test_scores', {}) 
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_sum_runs_on_server(db, executed):
+    """sum_async aggregates with SQL SUM() instead of fetching rows."""
+    total = await db.sum_async('test_scores', 'score', {'user_id': 1})
+
+    assert total == 0
+    assert executed == ['SELECT COALESCE(SUM(score), 0) FROM test_scores WHERE user_id = %s'] 
+
+@pytest.mark.asyncio
+async def test_import_rejects_unsafe_header(db, tmp_path):
+    """CSV header cells must be plain column names before they reach LOAD DATA."""
+    path = tmp_path / 'users.csv'
+    path.write_text('name,age) ; DROP TABLE test_users; --\nJohn,20\n')
+    with pytest.raises(ValueError):
+        await db.import_from_file_async('test_users', str(path))
+
+    path.write_text('')
+    with pytest.raises(ValueError):
+        await db.import_from_file_async('test_users', str(path))
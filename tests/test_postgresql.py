@@ -1,5 +1,5 @@
 import pytest
-from odbms.orms.postgresqldb import PostgresqlDB
+from odbms.orms.postgresqldb import PostgresqlDB, PostgresqlDBSync
 import asyncio
 
 @pytest.fixture
@@ -12,11 +12,8 @@ async def db():
         'user': 'postgres',
         'password': 'postgres'
     }
-    PostgresqlDB.connect(dbsettings=settings)
-    
-    # Wait for pool to be ready
-    while PostgresqlDB._pool is None:
-        await asyncio.sleep(0.01)
+    # The pool is created on the test loop, which runs the *_async calls
+    await PostgresqlDB.connect_async(dbsettings=settings)
     
     # Create test tables
     async with PostgresqlDB._pool.acquire() as conn:
@@ -35,6 +32,13 @@ async def db():
                     score INTEGER
                 )
             """)
+            await cur.execute("""
+                CREATE TABLE IF NOT EXISTS test_events (
+                    id SERIAL PRIMARY KEY,
+                    name VARCHAR(100),
+                    created_at TIMESTAMP
+                )
+            """)
             await conn.commit()
     
     yield PostgresqlDB
@@ -42,11 +46,12 @@ async def db():
     # Drop test tables
     async with PostgresqlDB._pool.acquire() as conn:
         async with conn.cursor() as cur:
+            await cur.execute("DROP TABLE IF EXISTS test_events")
             await cur.execute("DROP TABLE IF EXISTS test_scores")
             await cur.execute("DROP TABLE IF EXISTS test_users")
             await conn.commit()
     
-    PostgresqlDB.disconnect()
+    await PostgresqlDB.disconnect_async()
 
 @pytest.mark.asyncio
 async def test_crud_operations(db):
@@ -137,4 +142,82 @@ async def test_sum_operation(db):
     
     # Test sum
     total = await db.sum_async('test_scores', 'score', {'user_id': 1})
-    assert total == 30 
\ No newline at end of file
+    assert total == 30 
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("binary", [False, True])
+async def test_bulk_load_iso_timestamps(db, binary):
+    """COPY accepts timestamps given as ISO strings, as Model.bulk_save sends them."""
+    rows = [
+        {'name': f'event {i}', 'created_at': f'2024-01-02T03:04:{i % 60:02d}.123456'}
+        for i in range(db.copy_threshold)
+    ]
+    inserted = await db.insert_many_async('test_events', rows, binary=binary)
+    assert inserted == db.copy_threshold
+    assert await db.count_async('test_events') == db.copy_threshold
+
+    event = await db.find_one_async('test_events', {'name': 'event 1'})
+    assert event['created_at'].isoformat() == '2024-01-02T03:04:01.123456'
+
+    await db.remove_async('test_events', {})
+
+@pytest.mark.asyncio
+async def test_nested_streams_in_transaction(db):
+    """Two find_iter_async streams can be open at once inside one transaction."""
+    await db.insert_many_async('test_users', [{'name': 'John', 'age': 20}, {'name': 'Jane', 'age': 25}])
+
+    pairs = []
+    async with db.transaction():
+        async for outer in db.find_iter_async('test_users', columns=['name']):
+            async for inner in db.find_iter_async('test_users', columns=['name']):
+                pairs.append((outer['name'], inner['name']))
+    assert len(pairs) == 4
+
+    await db.remove_async('test_users', {})
+
+def test_sync_backend_is_a_sibling():
+    """PostgresqlDBSync shares the SQL builders but not PostgresqlDB's API or state."""
+    assert not issubclass(PostgresqlDBSync, PostgresqlDB)
+    assert not hasattr(PostgresqlDBSync, 'transaction')
+    assert not hasattr(PostgresqlDBSync, 'find_iter_async')
+    assert PostgresqlDBSync._select_sql('test_users', ('age',), ['name']) == PostgresqlDB._select_sql('test_users', ('age',), ['name'])
+
+def test_copy_csv_quotes_values_and_leaves_nulls_bare():
+    """A literal \\N or empty string stays text; only None becomes an unquoted NULL field."""
+    class Cursor:
+        rowcount = 3
+        def copy_expert(self, sql, buf):
+            self.sql, self.text = sql, buf.read()
+
+    cur = Cursor()
+    rows = [
+        {'age': None, 'name': '\\N'},
+        {'age': 3, 'name': 'say "hi", bye'},
+        {'age': 4, 'name': ''},
+    ]
+    assert PostgresqlDB._copy_csv(cur, 'test_users', ('age', 'name'), rows) == 3
+    assert cur.text == ',"\\N"\n"3","say ""hi"", bye"\n"4",""\n'
+    assert cur.sql == "COPY test_users (age, name) FROM STDIN WITH (FORMAT CSV)"
+
+def test_sync_call_from_loop_thread_raises():
+    """A sync call on the background loop's thread fails fast instead of deadlocking."""
+    async def call_sync():
+        with pytest.raises(RuntimeError, match='event loop thread'):
+            PostgresqlDB.count('test_users')
+    
+    loop = PostgresqlDB._start_loop()
+    try:
+        asyncio.run_coroutine_threadsafe(call_sync(), loop).result(timeout=1)
+    finally:
+        PostgresqlDB.disconnect()
+
+@pytest.mark.asyncio
+async def test_async_call_on_foreign_loop_raises():
+    """A pool created on another loop is rejected rather than driven from this one."""
+    class ForeignLoopDB(PostgresqlDB):
+        _pool = object()
+        _pool_loop = None
+    
+    with pytest.raises(RuntimeError, match='another event loop'):
+        await ForeignLoopDB.count_async('test_users')
+